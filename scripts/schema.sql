@@ -42,6 +42,10 @@ WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_chunks_filing ON chunks(filing_id);
 CREATE INDEX IF NOT EXISTS idx_chunks_section ON chunks(section_name);
 
+-- Full-text index; match_chunks_text must use this exact expression
+CREATE INDEX IF NOT EXISTS idx_chunks_content_tsv ON chunks
+USING GIN (to_tsvector('english', content));
+
 -- Response cache table
 CREATE TABLE IF NOT EXISTS cache (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -147,6 +151,93 @@ BEGIN
 END;
 $$;
 
+-- Batched vector search: one round trip for several query embeddings.
+-- Embeddings are passed as pgvector text literals ('[0.1,0.2,...]').
+CREATE OR REPLACE FUNCTION match_chunks_batch(
+    query_embeddings TEXT[],
+    match_ticker TEXT,
+    match_count INT DEFAULT 10,
+    days_back INT DEFAULT 365,
+    filing_types TEXT[] DEFAULT NULL,
+    section_names TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    query_index INT,
+    id UUID,
+    content TEXT,
+    section_name TEXT,
+    filing_type TEXT,
+    filing_date DATE,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        (q.ord - 1)::INT,
+        m.id,
+        m.content,
+        m.section_name,
+        m.filing_type,
+        m.filing_date,
+        m.similarity
+    FROM unnest(query_embeddings) WITH ORDINALITY AS q(embedding, ord)
+    CROSS JOIN LATERAL match_chunks(
+        q.embedding::vector(384),
+        match_ticker,
+        match_count,
+        days_back,
+        filing_types,
+        section_names
+    ) m
+    ORDER BY q.ord, m.similarity DESC;
+END;
+$$;
+
+-- Full-text search over chunk content, used for literal lookups that
+-- skip query embedding. Similarity is 0; rows are ordered by text rank.
+CREATE OR REPLACE FUNCTION match_chunks_text(
+    query_text TEXT,
+    match_ticker TEXT,
+    match_count INT DEFAULT 10,
+    days_back INT DEFAULT 365,
+    filing_types TEXT[] DEFAULT NULL,
+    section_names TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    content TEXT,
+    section_name TEXT,
+    filing_type TEXT,
+    filing_date DATE,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        c.id,
+        c.content,
+        c.section_name,
+        f.filing_type,
+        f.filing_date,
+        0::FLOAT AS similarity
+    FROM chunks c
+    JOIN filings f ON c.filing_id = f.id
+    CROSS JOIN websearch_to_tsquery('english', query_text) AS q
+    WHERE 
+        f.ticker = match_ticker
+        AND f.filing_date >= CURRENT_DATE - make_interval(days => days_back)
+        AND (filing_types IS NULL OR f.filing_type = ANY(filing_types))
+        AND (section_names IS NULL OR c.section_name = ANY(section_names))
+        AND to_tsvector('english', c.content) @@ q
+    ORDER BY ts_rank(to_tsvector('english', c.content), q) DESC
+    LIMIT match_count;
+END;
+$$;
+
 -- Function to get cache statistics
 CREATE OR REPLACE FUNCTION get_cache_stats()
 RETURNS TABLE (
@@ -5,8 +5,13 @@ Splits SEC filing sections into semantically meaningful chunks for embedding.
 Preserves metadata and respects sentence boundaries.
 """
 
+import hashlib
 import re
-from typing import Dict, List, Optional, Any
+import sys
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from dataclasses import dataclass, field
 
 
@@ -19,6 +24,26 @@ class Chunk:
     end_char: int
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    @classmethod
+    def _make(
+        cls,
+        text: str,
+        chunk_index: int,
+        start_char: int,
+        end_char: int,
+        metadata: Dict[str, Any]
+    ) -> "Chunk":
+        """Build a Chunk without running the generated __init__ (hot path)."""
+        obj = object.__new__(cls)
+        obj.__dict__.update(
+            text=text,
+            chunk_index=chunk_index,
+            start_char=start_char,
+            end_char=end_char,
+            metadata=metadata,
+        )
+        return obj
+    
     @property
     def char_count(self) -> int:
         """Return the character count of the chunk text."""
@@ -42,11 +67,18 @@ class FilingChunker:
     # Alternative sentence boundaries (for edge cases)
     SOFT_BOUNDARIES = re.compile(r'(?<=[;:])\s+')
     
+    # How far back from the target end to look for a boundary
+    BOUNDARY_SEARCH_RANGE = 100
+    
+    # Boundary scans kept per chunker, keyed by a digest of the text
+    BOUNDARY_CACHE_SIZE = 4
+    
     def __init__(
         self,
         chunk_size: int = 800,
         chunk_overlap: int = 100,
-        min_chunk_size: int = 100
+        min_chunk_size: int = 100,
+        pool_metadata: bool = False
     ):
         """
         Initialize the chunker with configuration.
@@ -55,6 +87,9 @@ class FilingChunker:
             chunk_size: Target size for each chunk in characters (default: 800)
             chunk_overlap: Number of overlapping characters between chunks (default: 100)
             min_chunk_size: Minimum chunk size to emit (default: 100)
+            pool_metadata: Reuse metadata dicts handed back via release_chunks()
+                (default: False). Only enable when callers release chunks
+                they no longer hold references to.
         """
         if chunk_overlap >= chunk_size:
             raise ValueError("chunk_overlap must be less than chunk_size")
@@ -64,49 +99,97 @@ class FilingChunker:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
+        self.pool_metadata = pool_metadata
+        self._meta_pool: List[Dict[str, Any]] = []
+        self._boundary_cache: "OrderedDict[bytes, Tuple[array, array]]" = OrderedDict()
     
-    def _find_sentence_boundary(self, text: str, target_pos: int, search_range: int = 100) -> int:
+    def _borrow_meta(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Find the nearest sentence boundary to the target position.
-        
-        Searches within search_range characters before target_pos for a sentence ending.
-        Falls back to soft boundaries (semicolons, colons) if no sentence ending found.
+        Get a metadata dict for a new chunk, reusing a pooled one if available.
         
         Args:
-            text: The text to search in
-            target_pos: Target position to find boundary near
-            search_range: How far back to search for a boundary
+            metadata: Metadata to copy into the dict
             
         Returns:
-            Position of the best boundary found, or target_pos if none found
+            Dict containing a copy of metadata
         """
-        if target_pos >= len(text):
-            return len(text)
-        
-        # Search window: from (target_pos - search_range) to target_pos
-        search_start = max(0, target_pos - search_range)
-        search_text = text[search_start:target_pos]
+        if self._meta_pool:
+            meta = self._meta_pool.pop()
+            if metadata:
+                meta.update(metadata)
+            return meta
+        return dict(metadata) if metadata else {}
+    
+    def release_chunks(self, chunks: List[Chunk]) -> None:
+        """
+        Return chunk metadata dicts to the pool for reuse.
         
-        # Look for sentence endings (. ! ?) followed by space and capital letter
-        # We need to find the last one in the search window
-        best_boundary = None
+        No-op unless the chunker was created with pool_metadata=True. The
+        released chunks must not be used afterwards: their metadata is cleared.
         
-        # Find all sentence endings in the search window
-        for match in self.SENTENCE_ENDINGS.finditer(search_text):
-            best_boundary = search_start + match.start() + 1  # Position after the punctuation
+        Args:
+            chunks: Chunks the caller has finished with
+        """
+        if not self.pool_metadata:
+            return
+        for chunk in chunks:
+            meta = chunk.metadata
+            meta.clear()
+            self._meta_pool.append(meta)
+    
+    def _boundary_offsets(self, text: str) -> Tuple[Sequence[int], Sequence[int]]:
+        """
+        Locate every candidate break position in whitespace-normalized text.
         
-        if best_boundary is not None:
-            return best_boundary
+        Positions are the offsets of the single space that follows a sentence
+        ending (. ! ? before a capital letter) or a soft boundary (; :).
+        The last few scans are memoized on this chunker by a digest of the
+        text, so re-chunking a document skips the regex scan without keeping
+        the text itself alive.
         
-        # Fall back to soft boundaries (semicolons, colons)
-        for match in self.SOFT_BOUNDARIES.finditer(search_text):
-            best_boundary = search_start + match.start() + 1
+        Args:
+            text: Whitespace-normalized text to scan
+            
+        Returns:
+            Tuple of (sentence_breaks, soft_breaks), each sorted ascending
+        """
+        key = hashlib.blake2b(text.encode()).digest()
+        cached = self._boundary_cache.get(key)
+        if cached is not None:
+            self._boundary_cache.move_to_end(key)
+            return cached
+        
+        cached = self._boundary_cache[key] = _scan_boundaries(text)
+        while len(self._boundary_cache) > self.BOUNDARY_CACHE_SIZE:
+            self._boundary_cache.popitem(last=False)
+        return cached
+    
+    @staticmethod
+    def _last_break_before(
+        breaks: Sequence[int],
+        cursor: int,
+        window_start: int,
+        window_end: int
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Find the last break in [window_start, window_end] using a rising cursor.
         
-        if best_boundary is not None:
-            return best_boundary
+        The cursor only moves forward, so successive calls with increasing
+        window_end scan the break list once in total.
         
-        # No boundary found, use target position
-        return target_pos
+        Args:
+            breaks: Sorted break positions from _boundary_offsets
+            cursor: Index returned by the previous call (0 initially)
+            window_start: Smallest acceptable break position
+            window_end: Largest acceptable break position
+            
+        Returns:
+            Tuple of (new cursor, chunk end after the break or None if no break)
+        """
+        cursor = bisect_right(breaks, window_end, cursor)
+        if cursor and breaks[cursor - 1] >= window_start:
+            return cursor, breaks[cursor - 1] + 1
+        return cursor, None
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
@@ -121,8 +204,8 @@ class FilingChunker:
         # Split on sentence endings
         sentences = self.SENTENCE_ENDINGS.split(text)
         
-        # Clean up and filter empty sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Clean up and filter empty sentences (strip each sentence only once)
+        sentences = [s for s in map(str.strip, sentences) if s]
         
         return sentences
     
@@ -141,37 +224,31 @@ class FilingChunker:
         Returns:
             List of Chunk objects with text and metadata
         """
-        if not text or not text.strip():
+        if not text:
             return []
         
-        # Normalize whitespace
+        # Normalize whitespace (whitespace-only text normalizes to "")
         text = ' '.join(text.split())
+        if not text:
+            return []
         
         if len(text) <= self.chunk_size:
-            # Text fits in a single chunk
-            if len(text) >= self.min_chunk_size:
-                return [Chunk(
-                    text=text,
-                    chunk_index=0,
-                    start_char=0,
-                    end_char=len(text),
-                    metadata=dict(metadata) if metadata else {}
-                )]
-            else:
-                # Text is too short, return empty or single chunk based on content
-                if text.strip():
-                    return [Chunk(
-                        text=text,
-                        chunk_index=0,
-                        start_char=0,
-                        end_char=len(text),
-                        metadata=dict(metadata) if metadata else {}
-                    )]
-                return []
+            # Text fits in a single chunk. It is kept even when shorter than
+            # min_chunk_size so short sections are not lost, and no boundary
+            # scan is needed.
+            return [Chunk(
+                text=text,
+                chunk_index=0,
+                start_char=0,
+                end_char=len(text),
+                metadata=self._borrow_meta(metadata)
+            )]
         
         chunks = []
         current_pos = 0
         chunk_index = 0
+        sentence_breaks, soft_breaks = self._boundary_offsets(text)
+        sentence_cursor = soft_cursor = 0
         
         while current_pos < len(text):
             # Calculate target end position
@@ -181,28 +258,41 @@ class FilingChunker:
                 # Last chunk - take everything remaining
                 chunk_text = text[current_pos:].strip()
                 if len(chunk_text) >= self.min_chunk_size:
-                    chunks.append(Chunk(
-                        text=chunk_text,
-                        chunk_index=chunk_index,
-                        start_char=current_pos,
-                        end_char=len(text),
-                        metadata=dict(metadata) if metadata else {}
+                    chunks.append(Chunk._make(
+                        chunk_text,
+                        chunk_index,
+                        current_pos,
+                        len(text),
+                        self._borrow_meta(metadata)
                     ))
                 elif chunks and len(chunk_text) > 0:
                     # Merge with previous chunk if too small
                     prev_chunk = chunks[-1]
                     merged_text = prev_chunk.text + " " + chunk_text
-                    chunks[-1] = Chunk(
-                        text=merged_text,
-                        chunk_index=prev_chunk.chunk_index,
-                        start_char=prev_chunk.start_char,
-                        end_char=len(text),
-                        metadata=prev_chunk.metadata
+                    chunks[-1] = Chunk._make(
+                        merged_text,
+                        prev_chunk.chunk_index,
+                        prev_chunk.start_char,
+                        len(text),
+                        prev_chunk.metadata
                     )
                 break
             
-            # Find sentence boundary near target end
-            actual_end = self._find_sentence_boundary(text, target_end)
+            # Find the last sentence boundary in the search window before the
+            # target end, falling back to soft boundaries (semicolons, colons).
+            # A sentence break needs its capital letter inside the window, a
+            # soft break only its space. target_end strictly increases, so the
+            # cursors never move backwards.
+            search_start = max(0, target_end - self.BOUNDARY_SEARCH_RANGE) + 1
+            sentence_cursor, actual_end = self._last_break_before(
+                sentence_breaks, sentence_cursor, search_start, target_end - 2
+            )
+            soft_cursor, soft_end = self._last_break_before(
+                soft_breaks, soft_cursor, search_start, target_end - 1
+            )
+            if actual_end is None:
+                # No boundary found, use target position
+                actual_end = soft_end if soft_end is not None else target_end
             
             # Ensure we make progress
             if actual_end <= current_pos:
@@ -212,12 +302,12 @@ class FilingChunker:
             chunk_text = text[current_pos:actual_end].strip()
             
             if len(chunk_text) >= self.min_chunk_size:
-                chunks.append(Chunk(
-                    text=chunk_text,
-                    chunk_index=chunk_index,
-                    start_char=current_pos,
-                    end_char=actual_end,
-                    metadata=dict(metadata) if metadata else {}
+                chunks.append(Chunk._make(
+                    chunk_text,
+                    chunk_index,
+                    current_pos,
+                    actual_end,
+                    self._borrow_meta(metadata)
                 ))
                 chunk_index += 1
                 # Move to next position with overlap
@@ -255,24 +345,27 @@ class FilingChunker:
         Returns:
             List of Chunk objects with filing metadata
         """
+        # Intern the repeated identifiers so every chunk of a filing shares
+        # one string object per value (cheaper storage and dict comparisons)
         metadata = {
-            "section": section_name,
-            "filing_type": filing_type,
-            "ticker": ticker,
+            "section": sys.intern(section_name),
+            "filing_type": sys.intern(filing_type),
+            "ticker": sys.intern(ticker),
         }
         
         if filing_date:
-            metadata["filing_date"] = filing_date
+            metadata["filing_date"] = sys.intern(filing_date)
         if accession_number:
-            metadata["accession_number"] = accession_number
+            metadata["accession_number"] = sys.intern(accession_number)
         
         chunks = self.chunk_text(section_text, metadata)
         
-        # Add chunk-specific metadata
+        # Add chunk-specific metadata in a single pass over the final list
         total_chunks = len(chunks)
-        for chunk in chunks:
-            chunk.metadata["total_chunks"] = total_chunks
-            chunk.metadata["chunk_position"] = f"{chunk.chunk_index + 1}/{total_chunks}"
+        for position, chunk in enumerate(chunks, start=1):
+            chunk_metadata = chunk.metadata
+            chunk_metadata["total_chunks"] = total_chunks
+            chunk_metadata["chunk_position"] = f"{position}/{total_chunks}"
         
         return chunks
     
@@ -343,3 +436,19 @@ class FilingChunker:
             return chunk2.text[:overlap_length]
         
         return None
+
+
+def _scan_boundaries(text: str) -> Tuple[array, array]:
+    """
+    Scan text for sentence and soft boundary positions.
+    
+    Positions are stored as packed C ints. Results may be cached by
+    FilingChunker._boundary_offsets, so callers must not modify them.
+    """
+    sentence_breaks = array(
+        'i', [m.start() for m in FilingChunker.SENTENCE_ENDINGS.finditer(text)]
+    )
+    soft_breaks = array(
+        'i', [m.start() for m in FilingChunker.SOFT_BOUNDARIES.finditer(text)]
+    )
+    return sentence_breaks, soft_breaks
@@ -5,10 +5,70 @@ Parses SEC filings (10-K, 10-Q, 8-K) to extract structured sections.
 Handles HTML cleaning and section boundary detection.
 """
 
+import hashlib
+import html
 import re
-from typing import Dict, List, Optional, Tuple
-from bs4 import BeautifulSoup
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from selectolax.lexbor import LexborHTMLParser
+
+
+# Markup stripped by the regex fast path: script/style/noscript blocks with
+# their contents, comments, and any other tag. A tag must open with a letter,
+# "/", "!" or "?" so literal "<" characters in filing text survive. Quoted
+# attribute values are skipped whole, so a ">" inside one does not end the tag.
+_TAG_REST = r'''(?:"[^"]*"|'[^']*'|[^'">])*>'''
+_FAST_STRIP_RE = re.compile(
+    rf'<(script|style|noscript)\b{_TAG_REST}.*?</\1\s*>|<!--.*?-->|<[A-Za-z/!?]{_TAG_REST}',
+    re.S | re.I
+)
+
+# Whitespace normalization patterns
+_INLINE_WHITESPACE_RE = re.compile(r'[\t\r\f\v]+')
+_SPACES_RE = re.compile(r' +')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+@lru_cache(maxsize=None)
+def _section_header_regexes(
+    filing_type: str,
+    section_id: str,
+    section_name: str
+) -> Tuple[re.Pattern, ...]:
+    """
+    Build the compiled header patterns for one section.
+    
+    Compiled once per (filing type, section) and shared by every parser
+    instance, so repeated parses skip pattern construction.
+    
+    Args:
+        filing_type: Type of filing (10-K, 10-Q, 8-K)
+        section_id: Section identifier (e.g., "1A", "2.02")
+        section_name: Display name of the section
+        
+    Returns:
+        Tuple of compiled regexes matching the section header
+    """
+    if filing_type == "8-K":
+        # 8-K uses "Item X.XX" format
+        patterns = [
+            rf'(?:^|\n)\s*ITEM\s+{re.escape(section_id)}[.\s:\-]*',
+            rf'(?:^|\n)\s*{re.escape(section_id)}[.\s:\-]+{re.escape(section_name[:15])}',
+        ]
+    else:
+        # 10-K and 10-Q use "Item X" or "ITEM X" format
+        # Handle variations like "Item 1A", "ITEM 1A.", "Item 1A -", "Item 1A:"
+        section_id_pattern = re.escape(section_id).replace(r'\-', r'[\-]?')
+        patterns = [
+            rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}[.\s:\-]+',
+            rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}\s*$',
+            rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}\s+{re.escape(section_name[:10])}',
+        ]
+    
+    return tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns)
 
 
 @dataclass
@@ -89,9 +149,23 @@ class SECFilingParser:
         "9.01": "Financial Statements and Exhibits",
     }
     
-    def __init__(self):
-        """Initialize the parser."""
-        pass
+    # Elements removed (with their contents) before text extraction
+    SKIP_TAGS = ["script", "style", "meta", "link", "noscript"]
+    SKIP_SELECTOR = ", ".join(SKIP_TAGS)
+    
+    def __init__(self, cache_size: int = 8):
+        """
+        Initialize the parser.
+        
+        Args:
+            cache_size: Number of recently parsed filings whose sections are
+                kept, so get_risk_factors and get_mda on the same filing
+                parse it once (0 disables caching). Entries are keyed by a
+                digest of the HTML, so only the sections stay in memory.
+        """
+        self.cache_size = cache_size
+        self._section_cache: "OrderedDict[Tuple[str, bool, bytes], Dict[str, ParsedSection]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def clean_html(self, html_content: str) -> str:
         """
@@ -107,25 +181,41 @@ class SECFilingParser:
             return ""
         
         # Parse HTML
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        # Remove script and style elements
-        for element in soup(["script", "style", "meta", "link", "noscript"]):
-            element.decompose()
+        tree = LexborHTMLParser(html_content)
         
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, type(soup.new_string("")))):
-            if hasattr(comment, 'extract') and str(comment).strip().startswith('<!--'):
-                comment.extract()
+        # Remove script, style and other non-content elements. One grouped
+        # selector walks the tree once; decomposing in reverse document order
+        # removes nested matches (e.g. <link> inside <noscript>) before their
+        # ancestors, so no node is freed twice.
+        for node in reversed(tree.css(self.SKIP_SELECTOR)):
+            node.decompose()
         
-        # Get text content
-        text = soup.get_text(separator=" ")
+        # Get text content (comment nodes are not included in text())
+        text = tree.root.text(separator=" ") if tree.root is not None else ""
         
         # Clean up whitespace
         text = self._normalize_whitespace(text)
         
         return text
     
+    def _fast_clean_html(self, html_content: str) -> str:
+        """
+        Strip markup with a single regex pass instead of building a DOM.
+        
+        Args:
+            html_content: Raw HTML string from SEC filing
+            
+        Returns:
+            Cleaned text content without HTML tags
+        """
+        if not html_content:
+            return ""
+        
+        text = _FAST_STRIP_RE.sub(" ", html_content)
+        text = html.unescape(text)
+        
+        return self._normalize_whitespace(text)
+    
     def _normalize_whitespace(self, text: str) -> str:
         """
         Normalize whitespace in text.
@@ -135,18 +225,19 @@ class SECFilingParser:
         - Strip leading/trailing whitespace
         """
         # Replace tabs and other whitespace with spaces
-        text = re.sub(r'[\t\r\f\v]+', ' ', text)
+        text = _INLINE_WHITESPACE_RE.sub(' ', text)
         
         # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
-        
-        # Replace 3+ newlines with double newline
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _SPACES_RE.sub(' ', text)
         
         # Strip whitespace from each line
         lines = [line.strip() for line in text.split('\n')]
         text = '\n'.join(lines)
         
+        # Replace 3+ newlines with double newline (after stripping, so
+        # whitespace-only lines between them collapse too)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        
         # Remove empty lines at start/end
         text = text.strip()
         
@@ -172,29 +263,10 @@ class SECFilingParser:
         boundaries = []
         
         for section_id, section_name in section_patterns.items():
-            # Build multiple regex patterns for section header (more flexible)
-            patterns = []
-            
-            if filing_type == "8-K":
-                # 8-K uses "Item X.XX" format
-                patterns = [
-                    rf'(?:^|\n)\s*ITEM\s+{re.escape(section_id)}[.\s:\-]*',
-                    rf'(?:^|\n)\s*{re.escape(section_id)}[.\s:\-]+{re.escape(section_name[:15])}',
-                ]
-            else:
-                # 10-K and 10-Q use "Item X" or "ITEM X" format
-                # Handle variations like "Item 1A", "ITEM 1A.", "Item 1A -", "Item 1A:"
-                section_id_pattern = re.escape(section_id).replace(r'\-', r'[\-]?')
-                patterns = [
-                    rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}[.\s:\-]+',
-                    rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}\s*$',
-                    rf'(?:^|\n)\s*ITEM\s+{section_id_pattern}\s+{re.escape(section_name[:10])}',
-                ]
-            
+            # Multiple precompiled patterns per section header (more flexible)
             all_matches = []
-            for pattern in patterns:
-                matches = list(re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
-                all_matches.extend(matches)
+            for pattern in _section_header_regexes(filing_type, section_id, section_name):
+                all_matches.extend(pattern.finditer(text))
             
             if all_matches:
                 # Deduplicate by position (within 50 chars)
@@ -273,72 +345,170 @@ class SECFilingParser:
             end_index=end
         )
     
-    def parse_10k(self, html_content: str) -> Dict[str, ParsedSection]:
+    def _sections_from_text(
+        self,
+        text: str,
+        section_patterns: Dict[str, str],
+        filing_type: str,
+        target_sections: Optional[Set[str]] = None
+    ) -> Dict[str, ParsedSection]:
         """
-        Parse a 10-K filing and extract key sections.
-        
-        Extracts: Item 1 (Business), 1A (Risk Factors), 7 (MD&A), 
-                  7A (Market Risk), 8 (Financial Statements)
+        Locate and extract sections from cleaned filing text.
         
         Args:
-            html_content: Raw HTML content of 10-K filing
+            text: Cleaned text content
+            section_patterns: Dict mapping section IDs to names
+            filing_type: Type of filing (10-K, 10-Q, 8-K)
+            target_sections: Section IDs to keep (default: all found)
             
         Returns:
             Dict mapping section IDs to ParsedSection objects
         """
-        # Clean HTML
-        text = self.clean_html(html_content)
-        
         if not text:
             return {}
         
-        # Target sections for 10-K analysis
-        target_sections = {"1", "1A", "7", "7A", "8"}
-        
-        # Find all section boundaries
-        boundaries = self._find_section_boundaries(text, self.SECTION_10K, "10-K")
+        boundaries = self._find_section_boundaries(text, section_patterns, filing_type)
         
-        # Extract target sections
         result = {}
         for section_id, start, end in boundaries:
-            if section_id in target_sections:
+            if target_sections is None or section_id in target_sections:
                 result[section_id] = self._extract_section(
-                    text, section_id, start, end, self.SECTION_10K
+                    text, section_id, start, end, section_patterns
                 )
         
         return result
     
-    def parse_10q(self, html_content: str) -> Dict[str, ParsedSection]:
+    def _fast_extract_sections(
+        self,
+        html_content: str,
+        section_patterns: Dict[str, str],
+        filing_type: str,
+        target_sections: Optional[Set[str]] = None
+    ) -> Dict[str, ParsedSection]:
         """
-        Parse a 10-Q filing and extract key sections.
+        Extract sections from text produced by the regex fast path.
         
-        Extracts: Part I Item 2 (MD&A), Item 3 (Market Risk)
+        Section detection only looks at ITEM headers in the flattened text,
+        so the DOM is not needed when the markup is well-formed.
         
         Args:
-            html_content: Raw HTML content of 10-Q filing
+            html_content: Raw HTML content
+            section_patterns: Dict mapping section IDs to names
+            filing_type: Type of filing (10-K, 10-Q, 8-K)
+            target_sections: Section IDs to keep (default: all found)
             
         Returns:
             Dict mapping section IDs to ParsedSection objects
         """
-        # Clean HTML
-        text = self.clean_html(html_content)
+        text = self._fast_clean_html(html_content)
+        return self._sections_from_text(text, section_patterns, filing_type, target_sections)
+    
+    def _parse_sections(
+        self,
+        html_content: str,
+        section_patterns: Dict[str, str],
+        filing_type: str,
+        target_sections: Optional[Set[str]] = None,
+        robust: bool = False
+    ) -> Dict[str, ParsedSection]:
+        """
+        Parse sections, trying the regex fast path before the DOM parser.
         
-        if not text:
+        Results are cached per filing (LRU, cache_size entries), so several
+        convenience calls on the same HTML only parse it once.
+        
+        Args:
+            html_content: Raw HTML content
+            section_patterns: Dict mapping section IDs to names
+            filing_type: Type of filing (10-K, 10-Q, 8-K)
+            target_sections: Section IDs to keep (default: all found)
+            robust: Skip the fast path and always clean with the DOM parser
+            
+        Returns:
+            Dict mapping section IDs to ParsedSection objects
+        """
+        if not html_content:
             return {}
         
-        # Find section boundaries
-        boundaries = self._find_section_boundaries(text, self.SECTION_10Q, "10-Q")
+        # Key on a digest so the cache does not pin multi-MB filing HTML
+        cache_key = (filing_type, robust, hashlib.blake2b(html_content.encode()).digest())
+        with self._cache_lock:
+            cached = self._section_cache.get(cache_key)
+            if cached is not None:
+                self._section_cache.move_to_end(cache_key)
         
-        # Extract all found sections
-        result = {}
-        for section_id, start, end in boundaries:
-            result[section_id] = self._extract_section(
-                text, section_id, start, end, self.SECTION_10Q
+        if cached is None:
+            cached = self._parse_uncached(
+                html_content, section_patterns, filing_type, target_sections, robust
+            )
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    self._section_cache[cache_key] = cached
+                    while len(self._section_cache) > self.cache_size:
+                        self._section_cache.popitem(last=False)
+        
+        # Hand out copies so callers cannot mutate the cached sections
+        return {section_id: replace(section) for section_id, section in cached.items()}
+    
+    def _parse_uncached(
+        self,
+        html_content: str,
+        section_patterns: Dict[str, str],
+        filing_type: str,
+        target_sections: Optional[Set[str]],
+        robust: bool
+    ) -> Dict[str, ParsedSection]:
+        """Run the fast path, falling back to the DOM parser if it finds nothing."""
+        if not robust:
+            sections = self._fast_extract_sections(
+                html_content, section_patterns, filing_type, target_sections
             )
+            if sections:
+                return sections
         
-        return result
+        # Fast path found nothing (or was skipped); fall back to the DOM
+        text = self.clean_html(html_content)
+        return self._sections_from_text(text, section_patterns, filing_type, target_sections)
+    
+    def parse_10k(self, html_content: str, robust: bool = False) -> Dict[str, ParsedSection]:
+        """
+        Parse a 10-K filing and extract key sections.
+        
+        Extracts: Item 1 (Business), 1A (Risk Factors), 7 (MD&A), 
+                  7A (Market Risk), 8 (Financial Statements)
+        
+        Args:
+            html_content: Raw HTML content of 10-K filing
+            robust: Always parse with the DOM parser instead of the fast path
+            
+        Returns:
+            Dict mapping section IDs to ParsedSection objects
+        """
+        # Target sections for 10-K analysis
+        target_sections = {"1", "1A", "7", "7A", "8"}
+        
+        return self._parse_sections(
+            html_content, self.SECTION_10K, "10-K", target_sections, robust
+        )
+    
+    def parse_10q(self, html_content: str, robust: bool = False) -> Dict[str, ParsedSection]:
+        """
+        Parse a 10-Q filing and extract key sections.
+        
+        Extracts: Part I Item 2 (MD&A), Item 3 (Market Risk)
+        
+        Args:
+            html_content: Raw HTML content of 10-Q filing
+            robust: Always parse with the DOM parser instead of the fast path
+            
+        Returns:
+            Dict mapping section IDs to ParsedSection objects
+        """
+        return self._parse_sections(
+            html_content, self.SECTION_10Q, "10-Q", robust=robust
+        )
     
-    def parse_8k(self, html_content: str) -> Dict[str, ParsedSection]:
+    def parse_8k(self, html_content: str, robust: bool = False) -> Dict[str, ParsedSection]:
         """
         Parse an 8-K filing and extract material event sections.
         
@@ -349,27 +519,14 @@ class SECFilingParser:
         
         Args:
             html_content: Raw HTML content of 8-K filing
+            robust: Always parse with the DOM parser instead of the fast path
             
         Returns:
             Dict mapping section IDs to ParsedSection objects
         """
-        # Clean HTML
-        text = self.clean_html(html_content)
-        
-        if not text:
-            return {}
-        
-        # Find section boundaries
-        boundaries = self._find_section_boundaries(text, self.SECTION_8K, "8-K")
-        
-        # Extract all found sections
-        result = {}
-        for section_id, start, end in boundaries:
-            result[section_id] = self._extract_section(
-                text, section_id, start, end, self.SECTION_8K
-            )
-        
-        return result
+        return self._parse_sections(
+            html_content, self.SECTION_8K, "8-K", robust=robust
+        )
     
     def parse(self, html_content: str, filing_type: str) -> Dict[str, ParsedSection]:
         """
@@ -42,7 +42,7 @@ class Chunk:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """Vector search result."""
     id: str
@@ -98,6 +98,11 @@ class SupabaseStore:
     
     DEFAULT_CACHE_TTL_HOURS = 24
     
+    # Optional search RPCs added to scripts/schema.sql after the core schema;
+    # callers check these flags and fall back to vector_search
+    supports_batch_search = True
+    supports_keyword_search = True
+    
     def __init__(self, client=None):
         """
         Initialize store with optional client injection for testing.
@@ -420,6 +425,110 @@ class SupabaseStore:
             
         return results
     
+    def vector_search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        ticker: str,
+        match_count: int = 10,
+        days_back: int = 365,
+        filing_types: Optional[List[str]] = None,
+        section_names: Optional[List[str]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Perform several similarity searches in one database round trip.
+        
+        Args:
+            query_embeddings: Query embeddings of shape (n_queries, 384)
+            ticker: Stock ticker to search
+            match_count: Number of results to return per query
+            days_back: How far back to search
+            filing_types: Optional list of filing types to filter
+            section_names: Optional list of section names to filter
+            
+        Returns:
+            One list of search results per query, each ordered by similarity
+        """
+        # pgvector text literals; PostgREST cannot pass nested arrays as vector[]
+        params = {
+            "query_embeddings": [
+                "[" + ",".join(map(str, row)) + "]"
+                for row in np.atleast_2d(query_embeddings).tolist()
+            ],
+            "match_ticker": ticker,
+            "match_count": match_count,
+            "days_back": days_back,
+        }
+        
+        if filing_types:
+            params["filing_types"] = filing_types
+        if section_names:
+            params["section_names"] = section_names
+        
+        result = self.client.rpc("match_chunks_batch", params).execute()
+        
+        results: List[List[SearchResult]] = [[] for _ in params["query_embeddings"]]
+        for row in result.data:
+            results[row["query_index"]].append(SearchResult(
+                id=row["id"],
+                content=row["content"],
+                section_name=row["section_name"],
+                filing_type=row["filing_type"],
+                filing_date=date.fromisoformat(row["filing_date"]),
+                similarity=row["similarity"],
+            ))
+        
+        return results
+    
+    def keyword_search(
+        self,
+        query: str,
+        ticker: str,
+        match_count: int = 10,
+        days_back: int = 365,
+        filing_types: Optional[List[str]] = None,
+        section_names: Optional[List[str]] = None
+    ) -> List[SearchResult]:
+        """
+        Perform full-text search over chunk content, without an embedding.
+        
+        Args:
+            query: Search text (websearch syntax, so quoted phrases match exactly)
+            ticker: Stock ticker to search
+            match_count: Number of results to return
+            days_back: How far back to search
+            filing_types: Optional list of filing types to filter
+            section_names: Optional list of section names to filter
+            
+        Returns:
+            List of search results ordered by text rank, with similarity 0.0
+        """
+        params = {
+            "query_text": query,
+            "match_ticker": ticker,
+            "match_count": match_count,
+            "days_back": days_back,
+        }
+        
+        if filing_types:
+            params["filing_types"] = filing_types
+        if section_names:
+            params["section_names"] = section_names
+        
+        result = self.client.rpc("match_chunks_text", params).execute()
+        
+        results = []
+        for row in result.data:
+            results.append(SearchResult(
+                id=row["id"],
+                content=row["content"],
+                section_name=row["section_name"],
+                filing_type=row["filing_type"],
+                filing_date=date.fromisoformat(row["filing_date"]),
+                similarity=0.0,
+            ))
+        
+        return results
+    
     def delete_chunks_by_filing(self, filing_id: str) -> int:
         """
         Delete all chunks for a filing.
@@ -1,26 +1,58 @@
 import os
-from supabase import create_client, Client
-from typing import Optional
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# The Supabase SDK is imported on first use so that importing src.data does
+# not pay for loading it. Rebound by _get_create_client().
+create_client = None
+
+# Missing values and the placeholders shipped in .env.example
+_PLACEHOLDER_VALUES = frozenset({
+    None,
+    "",
+    "https://your-project.supabase.co",
+    "your-anon-key-here",
+})
+
+
+def _get_create_client():
+    """Import supabase.create_client on first call and cache it."""
+    global create_client
+    if create_client is None:
+        from supabase import create_client as _create_client
+        create_client = _create_client
+    return create_client
 
 class SupabaseClient:
-    """Singleton Supabase client wrapper."""
+    """Per-thread singleton Supabase client wrapper."""
     
-    _instance: Optional[Client] = None
+    # Each thread gets its own client (and connection pool), so threaded
+    # ingest workers never share or contend on one instance
+    _tls = threading.local()
     
     @classmethod
-    def get_client(cls) -> Client:
-        """Get or create Supabase client."""
-        if cls._instance is None:
+    def get_client(cls) -> "Client":
+        """Get or create the Supabase client for the current thread."""
+        client = getattr(cls._tls, "client", None)
+        if client is None:
             url = os.environ.get("SUPABASE_URL")
             key = os.environ.get("SUPABASE_KEY")
             
-            if not url or not key or url == "https://your-project.supabase.co":
+            if url in _PLACEHOLDER_VALUES or key in _PLACEHOLDER_VALUES:
                 raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env")
                 
-            cls._instance = create_client(url, key)
+            client = cls._tls.client = _get_create_client()(url, key)
             
-        return cls._instance
+        return client
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the current thread's cached client."""
+        cls._tls.__dict__.clear()
 
-def get_supabase() -> Client:
+def get_supabase() -> "Client":
     """Helper function to get Supabase client."""
     return SupabaseClient.get_client()
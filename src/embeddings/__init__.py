@@ -1,3 +1,3 @@
-from .embedder import LocalEmbedder, EmbeddingResult
+from .embedder import LocalEmbedder, EmbeddingResult, BatchEmbeddingResult
 
-__all__ = ["LocalEmbedder", "EmbeddingResult"]
+__all__ = ["LocalEmbedder", "EmbeddingResult", "BatchEmbeddingResult"]
@@ -5,18 +5,150 @@ Generates 384-dimensional embeddings using BGE-small-en-v1.5 model.
 Optimized for CPU inference on free tier deployments.
 """
 
+import contextlib
+import hashlib
+import math
+import os
+import struct
+import threading
 import numpy as np
-from typing import List, Optional, Union
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmbeddingResult:
-    """Result of an embedding operation."""
+    """
+    Result of an embedding operation.
+    
+    When the embedding is int8-quantized, scale holds the factor that
+    recovers float values (see LocalEmbedder.dequantize). Slotted and
+    immutable to keep per-result overhead low in large ingest runs.
+    """
     embedding: np.ndarray
     text: str
     model: str
     dimensions: int
+    scale: Optional[float] = None
+    
+    # magic, dimensions, text length, model length, dtype char, scale (NaN if unset)
+    _HEADER = struct.Struct("<4sIIIcxxxf")
+    _MAGIC = b"EMB\0"
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to a compact binary record without pickle.
+        
+        int8 and float16 embeddings keep their dtype; anything else is
+        stored as float32.
+        """
+        embedding = self.embedding
+        if embedding.dtype not in (np.int8, np.float16):
+            embedding = embedding.astype(np.float32)
+        text = self.text.encode("utf-8")
+        model = self.model.encode("utf-8")
+        header = self._HEADER.pack(
+            self._MAGIC,
+            self.dimensions,
+            len(text),
+            len(model),
+            embedding.dtype.char.encode("ascii"),
+            float("nan") if self.scale is None else self.scale
+        )
+        return b"".join((header, text, model, embedding.tobytes()))
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EmbeddingResult":
+        """Deserialize a record produced by to_bytes."""
+        magic, dimensions, text_len, model_len, dtype_char, scale = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("Not a serialized EmbeddingResult")
+        
+        offset = cls._HEADER.size
+        text = data[offset:offset + text_len].decode("utf-8")
+        offset += text_len
+        model = data[offset:offset + model_len].decode("utf-8")
+        offset += model_len
+        embedding = np.frombuffer(data, dtype=np.dtype(dtype_char.decode("ascii")), offset=offset).copy()
+        
+        return cls(
+            embedding=embedding,
+            text=text,
+            model=model,
+            dimensions=dimensions,
+            scale=None if math.isnan(scale) else scale
+        )
+
+
+@dataclass(slots=True)
+class BatchEmbeddingResult:
+    """
+    Result of a batch embedding operation.
+    
+    Stores all embeddings in one contiguous (n, dims) matrix alongside
+    parallel texts, rather than one EmbeddingResult per text.
+    """
+    embeddings: np.ndarray
+    texts: List[str]
+    model: str
+    dimensions: int
+    scales: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def row(self, index: int) -> EmbeddingResult:
+        """Get a single text's result as an EmbeddingResult."""
+        return EmbeddingResult(
+            embedding=self.embeddings[index],
+            text=self.texts[index],
+            model=self.model,
+            dimensions=self.dimensions,
+            scale=None if self.scales is None else float(self.scales[index])
+        )
+
+
+class _OnnxEncoder:
+    """
+    ONNX Runtime encoder with a SentenceTransformer-compatible encode().
+    
+    Uses CLS pooling, matching the pooling configured for BGE models.
+    """
+    
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Encode one text or a list of texts into embeddings."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else sentences
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            batches.append(np.asarray(hidden[:, 0], dtype=np.float32))
+        
+        embeddings = np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.where(norms > 0, norms, 1.0)
+        
+        return embeddings[0] if single else embeddings
 
 
 class LocalEmbedder:
@@ -29,13 +161,23 @@ class LocalEmbedder:
     
     DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
     EMBEDDING_DIM = 384
+    STORAGE_DTYPES = ("float32", "float16", "bfloat16")
+    BACKENDS = ("torch", "onnx")
+    # BGE instruction prefix for retrieval queries
+    QUERY_PREFIX = "Represent this sentence for searching relevant passages: "
+    # Buffers kept per batch length by release_buffer
+    MAX_POOLED_BUFFERS = 4
     
     def __init__(
         self,
         model_name: Optional[str] = None,
         device: str = "cpu",
         normalize: bool = True,
-        cache_dir: Optional[str] = None
+        cache_dir: Optional[str] = None,
+        storage_dtype: str = "float32",
+        embedding_cache_dir: Optional[Union[str, Path]] = None,
+        backend: str = "torch",
+        truncate_dim: Optional[int] = None
     ):
         """
         Initialize the embedder.
@@ -45,22 +187,160 @@ class LocalEmbedder:
             device: Device to run inference on (default: cpu)
             normalize: Whether to L2-normalize embeddings (default: True)
             cache_dir: Directory to cache model files
+            storage_dtype: dtype of returned embeddings: float32 (default),
+                float16 or bfloat16 (requires ml-dtypes). Half precision
+                halves memory and bandwidth for similarity scans.
+            embedding_cache_dir: Directory for an on-disk embedding cache keyed
+                by text content, so repeated texts skip model inference
+                (default: None, no caching)
+            backend: Inference backend: torch (sentence-transformers, default)
+                or onnx (ONNX Runtime via optimum, CPU only)
+            truncate_dim: Keep only the first truncate_dim dimensions of each
+                embedding (Matryoshka truncation), renormalized when
+                normalize is set (default: None, full 384 dimensions)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(self.BACKENDS)}")
+        if truncate_dim is not None and not 0 < truncate_dim <= self.EMBEDDING_DIM:
+            raise ValueError(f"truncate_dim must be between 1 and {self.EMBEDDING_DIM}")
+        if storage_dtype not in self.STORAGE_DTYPES:
+            raise ValueError(
+                f"storage_dtype must be one of {', '.join(self.STORAGE_DTYPES)}"
+            )
+        
         self.model_name = model_name or self.DEFAULT_MODEL
         self.device = device
         self.normalize = normalize
         self.cache_dir = cache_dir
+        self.backend = backend
+        self.truncate_dim = truncate_dim
+        self.output_dim = truncate_dim or self.EMBEDDING_DIM
+        self.storage_dtype = storage_dtype
+        self._storage_np_dtype = self._resolve_storage_dtype(storage_dtype)
+        self.embedding_cache_dir = Path(embedding_cache_dir) if embedding_cache_dir else None
+        if self.embedding_cache_dir is not None:
+            self.embedding_cache_dir.mkdir(parents=True, exist_ok=True)
         self._model = None
+        self._load_lock = threading.Lock()
+        self._out_pool: Dict[int, List[np.ndarray]] = {}
+    
+    @staticmethod
+    def _resolve_storage_dtype(storage_dtype: str) -> Optional[np.dtype]:
+        """Map a storage dtype name to a NumPy dtype (None for float32 passthrough)."""
+        if storage_dtype == "float32":
+            return None
+        if storage_dtype == "bfloat16":
+            try:
+                import ml_dtypes
+            except ImportError:
+                raise ImportError(
+                    "ml-dtypes is required for bfloat16 storage. "
+                    "Install with: pip install ml-dtypes"
+                )
+            return np.dtype(ml_dtypes.bfloat16)
+        return np.dtype(storage_dtype)
+    
+    def _cache_path(self, prepared: str) -> Optional[Path]:
+        """
+        Get the embedding cache file for prepared text.
+        
+        The key covers the model and normalization setting as well as the
+        text, so differently configured embedders never share entries.
+        """
+        if self.embedding_cache_dir is None:
+            return None
+        key = hashlib.blake2b(
+            f"{self.model_name}\0{self.normalize}\0{prepared}".encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        return self.embedding_cache_dir / f"{key}.npy"
+    
+    @staticmethod
+    def _cache_load(path: Optional[Path]) -> Optional[np.ndarray]:
+        """Load a cached embedding, or None on a miss or unreadable entry."""
+        if path is None:
+            return None
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _cache_store(path: Optional[Path], embedding: np.ndarray) -> None:
+        """Write an embedding to the cache atomically."""
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, embedding)
+        os.replace(tmp_path, path)
+    
+    def _acquire_buffer(self, n: int) -> np.ndarray:
+        """Get a zeroed (n, output_dim) float32 buffer, reusing a released one if possible."""
+        pooled = self._out_pool.get(n)
+        if pooled:
+            try:
+                buffer = pooled.pop()
+            except IndexError:
+                pass
+            else:
+                buffer.fill(0)
+                return buffer
+        return np.zeros((n, self.output_dim), dtype=np.float32)
+    
+    def release_buffer(self, buffer: np.ndarray) -> None:
+        """
+        Return a buffer from embed_batch(reuse_buffer=True) to the pool.
+        
+        Only C-contiguous float32 buffers of shape (n, output_dim) are kept;
+        anything else is ignored. The buffer must not be used after release.
+        """
+        if (
+            buffer.dtype != np.float32
+            or buffer.ndim != 2
+            or buffer.shape[1] != self.output_dim
+            or not buffer.flags.c_contiguous
+        ):
+            return
+        pooled = self._out_pool.setdefault(buffer.shape[0], [])
+        if len(pooled) < self.MAX_POOLED_BUFFERS:
+            pooled.append(buffer)
+    
+    def _truncate(self, embeddings: np.ndarray) -> np.ndarray:
+        """Truncate model output to truncate_dim, renormalizing if enabled."""
+        if self.truncate_dim is None:
+            return embeddings
+        truncated = embeddings[..., :self.truncate_dim]
+        if self.normalize:
+            return self._normalize_embedding(truncated)
+        return truncated
+    
+    def _to_storage_dtype(self, embeddings: np.ndarray) -> np.ndarray:
+        """Cast embeddings to the configured storage dtype."""
+        if self._storage_np_dtype is None:
+            return embeddings
+        return embeddings.astype(self._storage_np_dtype)
     
     @property
     def model(self):
-        """Lazy load the model on first use."""
+        """
+        Lazy load the model on first use.
+        
+        Double-checked locking: concurrent first requests load the model
+        once, and later calls skip the lock entirely.
+        """
         if self._model is None:
-            self._load_model()
+            with self._load_lock:
+                if self._model is None:
+                    self._load_model()
         return self._model
     
     def _load_model(self):
         """Load the sentence transformer model."""
+        if self.backend == "onnx":
+            self._model = self._load_onnx_model()
+            return
+        
         try:
             from sentence_transformers import SentenceTransformer
         except ImportError:
@@ -69,18 +349,145 @@ class LocalEmbedder:
                 "Install with: pip install sentence-transformers"
             )
         
+        self._configure_torch_threads()
         self._model = SentenceTransformer(
             self.model_name,
             device=self.device,
             cache_folder=self.cache_dir
         )
+        self._model.eval()
+    
+    @staticmethod
+    def _configure_torch_threads():
+        """
+        Use every CPU core for intra-op parallelism.
+        
+        Containers often report a single default thread to PyTorch, which
+        leaves the encoder bound to one core.
+        """
+        try:
+            import torch
+        except ImportError:
+            return
+        
+        torch.set_num_threads(os.cpu_count() or 1)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work starts
+            pass
+    
+    def _inference_context(self):
+        """Context that disables autograd tracking during encoding."""
+        if self.backend == "torch":
+            try:
+                import torch
+            except ImportError:
+                return contextlib.nullcontext()
+            return torch.inference_mode()
+        return contextlib.nullcontext()
+    
+    def _load_onnx_model(self) -> _OnnxEncoder:
+        """Export the model to ONNX and wrap it in an ONNX Runtime session."""
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError(
+                "optimum[onnxruntime] is required for the onnx backend. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+        
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        session_options.intra_op_num_threads = os.cpu_count() or 1
+        
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            self.model_name,
+            export=True,
+            provider="CPUExecutionProvider",
+            session_options=session_options,
+            cache_dir=self.cache_dir
+        )
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=self.cache_dir)
+        return _OnnxEncoder(model, tokenizer)
     
     def _normalize_embedding(self, embedding: np.ndarray) -> np.ndarray:
-        """L2 normalize an embedding vector."""
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            return embedding / norm
-        return embedding
+        """
+        L2 normalize an embedding vector or each row of an (n, dims) matrix.
+        
+        Integer input (e.g. int8-quantized vectors) is normalized as float32:
+        a per-vector scale does not change direction, so no dequantization is
+        needed. Half-precision input keeps its dtype. Zero vectors are
+        returned unchanged.
+        """
+        # Fast path for single full-precision vectors: one BLAS dot for the
+        # sum of squares and one scalar multiply, skipping the 2D machinery
+        if embedding.ndim == 1 and embedding.dtype in (np.float32, np.float64):
+            sum_squares = float(np.dot(embedding, embedding))
+            if sum_squares == 0.0:
+                return embedding.copy()
+            return embedding * (1.0 / math.sqrt(sum_squares))
+        
+        # Normalize integer and half-precision input in float32; only the
+        # half-precision storage dtypes are cast back
+        dtype = embedding.dtype
+        matrix = np.atleast_2d(embedding)
+        is_float = np.issubdtype(dtype, np.floating)
+        # bfloat16 (ml-dtypes) is not an np.floating subtype
+        cast_back = dtype.itemsize < 4 and (is_float or dtype == self._storage_np_dtype)
+        if cast_back or not is_float:
+            matrix = matrix.astype(np.float32)
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.maximum(norms, 1e-12, out=norms)
+        normalized = matrix / norms
+        if cast_back:
+            normalized = normalized.astype(dtype)
+        
+        return normalized[0] if embedding.ndim == 1 else normalized
+    
+    @staticmethod
+    def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, Union[np.ndarray, float]]:
+        """
+        Symmetrically quantize embeddings to int8 with a per-vector scale.
+        
+        Args:
+            embeddings: 1D vector or 2D array of shape (n, dims)
+            
+        Returns:
+            Tuple of (int8 array of the same shape, scale). The scale is a
+            float for a 1D input and an (n,) float32 array for a 2D input.
+        """
+        matrix = np.atleast_2d(embeddings).astype(np.float32, copy=False)
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        # All-zero rows (empty texts) keep scale 0 and quantize to zeros
+        divisors = np.where(scales > 0, scales, 1.0)[:, np.newaxis]
+        quantized = np.clip(np.round(matrix / divisors), -127, 127).astype(np.int8)
+        
+        if np.ndim(embeddings) == 1:
+            return quantized[0], float(scales[0])
+        return quantized, scales.astype(np.float32)
+    
+    @staticmethod
+    def dequantize(quantized: np.ndarray, scale: Union[np.ndarray, float]) -> np.ndarray:
+        """
+        Recover float32 embeddings from int8 values and their scales.
+        
+        Args:
+            quantized: int8 vector or (n, dims) array from quantize_int8
+            scale: Matching scale (float or (n,) array)
+            
+        Returns:
+            float32 array of the same shape as quantized
+        """
+        scale = np.asarray(scale, dtype=np.float32)
+        if quantized.ndim == 2:
+            scale = scale[:, np.newaxis]
+        return quantized.astype(np.float32) * scale
     
     def _prepare_text(self, text: str) -> str:
         """
@@ -88,9 +495,9 @@ class LocalEmbedder:
         
         BGE models work better with instruction prefix for queries.
         """
-        # Clean up whitespace
-        text = ' '.join(text.split())
-        return text
+        # str.split() with no separator collapses every whitespace run and
+        # drops leading/trailing whitespace in one C-level pass
+        return ' '.join(text.split())
     
     def embed_text(self, text: str) -> np.ndarray:
         """
@@ -103,22 +510,29 @@ class LocalEmbedder:
             384-dimensional numpy array
         """
         if not text or not text.strip():
-            return np.zeros(self.EMBEDDING_DIM)
+            return self._to_storage_dtype(np.zeros(self.output_dim))
         
         prepared = self._prepare_text(text)
-        embedding = self.model.encode(
-            prepared,
-            convert_to_numpy=True,
-            normalize_embeddings=self.normalize
-        )
+        cache_path = self._cache_path(prepared)
+        embedding = self._cache_load(cache_path)
         
-        return embedding
+        if embedding is None:
+            with self._inference_context():
+                embedding = self.model.encode(
+                    prepared,
+                    convert_to_numpy=True,
+                    normalize_embeddings=self.normalize
+                )
+            self._cache_store(cache_path, embedding)
+        
+        return self._to_storage_dtype(self._truncate(embedding))
     
     def embed_batch(
         self,
         texts: List[str],
         batch_size: int = 32,
-        show_progress: bool = False
+        show_progress: bool = False,
+        reuse_buffer: bool = False
     ) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
@@ -127,12 +541,15 @@ class LocalEmbedder:
             texts: List of texts to embed
             batch_size: Number of texts to process at once
             show_progress: Whether to show progress bar
+            reuse_buffer: Draw the output from a pool of float32 buffers
+                instead of allocating (default: False). The caller must
+                copy the result or hand it back with release_buffer.
             
         Returns:
             2D numpy array of shape (n_texts, 384)
         """
         if not texts:
-            return np.array([]).reshape(0, self.EMBEDDING_DIM)
+            return self._to_storage_dtype(np.array([]).reshape(0, self.output_dim))
         
         # Filter and prepare texts
         prepared_texts = []
@@ -144,75 +561,206 @@ class LocalEmbedder:
                 valid_indices.append(i)
         
         if not prepared_texts:
-            return np.zeros((len(texts), self.EMBEDDING_DIM))
-        
-        # Generate embeddings
-        embeddings = self.model.encode(
-            prepared_texts,
-            batch_size=batch_size,
-            convert_to_numpy=True,
-            normalize_embeddings=self.normalize,
-            show_progress_bar=show_progress
-        )
+            return self._to_storage_dtype(np.zeros((len(texts), self.output_dim)))
         
         # Create result array with zeros for empty texts
-        result = np.zeros((len(texts), self.EMBEDDING_DIM))
-        for i, idx in enumerate(valid_indices):
-            result[idx] = embeddings[i]
+        if reuse_buffer:
+            result = self._acquire_buffer(len(texts))
+        else:
+            result = np.zeros((len(texts), self.output_dim))
+        
+        # Fill cached embeddings and collect the texts that need the model
+        cache_paths = [self._cache_path(prepared) for prepared in prepared_texts]
+        missing = []
+        for i, cache_path in enumerate(cache_paths):
+            cached = self._cache_load(cache_path)
+            if cached is None:
+                missing.append(i)
+            else:
+                result[valid_indices[i]] = self._truncate(cached)
+        
+        if missing:
+            # Sort by length so each mini-batch pads to similar lengths;
+            # results are scattered back by index, which restores order
+            if len(missing) > batch_size:
+                missing.sort(key=lambda i: len(prepared_texts[i]))
+            
+            # Generate embeddings
+            with self._inference_context():
+                embeddings = self.model.encode(
+                    [prepared_texts[i] for i in missing],
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=self.normalize,
+                    show_progress_bar=show_progress
+                )
+            
+            truncated = self._truncate(embeddings)
+            for embedding, row, i in zip(embeddings, truncated, missing):
+                result[valid_indices[i]] = row
+                self._cache_store(cache_paths[i], embedding)
+        
+        stored = self._to_storage_dtype(result)
+        if reuse_buffer and stored is not result:
+            self.release_buffer(result)
+        return stored
+    
+    def embed_batch_into(
+        self,
+        texts: List[str],
+        out: np.ndarray,
+        batch_size: int = 32,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """
+        Generate embeddings directly into a preallocated buffer.
+        
+        Texts are embedded one batch at a time, so peak memory stays at a
+        single batch. Passing an np.memmap as out lets corpora larger than
+        RAM be embedded to disk and later scanned with similarity_batch.
+        
+        Args:
+            texts: List of texts to embed
+            out: C-contiguous float32 array of shape (n_texts, 384),
+                e.g. np.memmap(path, dtype=np.float32, mode="w+", shape=...)
+            batch_size: Number of texts to process at once
+            show_progress: Whether to show progress bar
+            
+        Returns:
+            out, filled with embeddings
+        """
+        if out.shape != (len(texts), self.output_dim):
+            raise ValueError(
+                f"out must have shape ({len(texts)}, {self.output_dim}), got {out.shape}"
+            )
+        if out.dtype != np.float32 or not out.flags.c_contiguous:
+            raise ValueError("out must be a C-contiguous float32 array")
+        
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            embeddings = self.embed_batch(
+                batch, batch_size=batch_size, show_progress=show_progress, reuse_buffer=True
+            )
+            out[start:start + len(batch)] = embeddings
+            self.release_buffer(embeddings)
+        
+        return out
+    
+    def embed_batch_quantized(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate int8-quantized embeddings for multiple texts.
+        
+        Cuts embedding memory and storage 4x compared to float32.
         
-        return result
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts to process at once
+            show_progress: Whether to show progress bar
+            
+        Returns:
+            Tuple of (int8 array of shape (n_texts, 384), (n_texts,) float32 scales)
+        """
+        embeddings = self.embed_batch(texts, batch_size=batch_size, show_progress=show_progress)
+        return self.quantize_int8(embeddings)
     
     def embed_query(self, query: str) -> np.ndarray:
         """
         Generate embedding for a search query.
         
         BGE models recommend prefixing queries with an instruction
-        for better retrieval performance.
+        for better retrieval performance. Queries ignore storage_dtype and
+        stay float32: they are never stored, and similarity against
+        half-precision vectors is computed in float32 anyway.
         
         Args:
             query: Search query text
             
         Returns:
-            384-dimensional numpy array
+            float32 numpy array of output_dim dimensions
         """
         if not query or not query.strip():
-            return np.zeros(self.EMBEDDING_DIM)
+            return np.zeros(self.output_dim, dtype=np.float32)
         
-        # BGE instruction prefix for queries
-        instruction = "Represent this sentence for searching relevant passages: "
-        prepared = instruction + self._prepare_text(query)
+        prepared = self.QUERY_PREFIX + self._prepare_text(query)
         
-        embedding = self.model.encode(
-            prepared,
-            convert_to_numpy=True,
-            normalize_embeddings=self.normalize
-        )
+        with self._inference_context():
+            embedding = self.model.encode(
+                prepared,
+                convert_to_numpy=True,
+                normalize_embeddings=self.normalize
+            )
         
-        return embedding
+        return self._truncate(embedding).astype(np.float32, copy=False)
     
-    def embed_with_metadata(self, text: str) -> EmbeddingResult:
+    def embed_with_metadata(self, text: str, quantize: bool = False) -> EmbeddingResult:
         """
         Generate embedding with full metadata.
         
         Args:
             text: Text to embed
+            quantize: Store the embedding as int8 with a scale (default: False)
             
         Returns:
             EmbeddingResult with embedding and metadata
         """
         embedding = self.embed_text(text)
+        scale = None
+        if quantize:
+            embedding, scale = self.quantize_int8(embedding)
         
         return EmbeddingResult(
             embedding=embedding,
             text=text,
             model=self.model_name,
-            dimensions=self.EMBEDDING_DIM
+            dimensions=self.output_dim,
+            scale=scale
+        )
+    
+    def embed_batch_with_metadata(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = False,
+        quantize: bool = False
+    ) -> BatchEmbeddingResult:
+        """
+        Generate embeddings for multiple texts with metadata.
+        
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts to process at once
+            show_progress: Whether to show progress bar
+            quantize: Store embeddings as int8 with per-row scales (default: False)
+            
+        Returns:
+            BatchEmbeddingResult holding an (n_texts, 384) matrix
+        """
+        embeddings = self.embed_batch(texts, batch_size=batch_size, show_progress=show_progress)
+        scales = None
+        if quantize:
+            embeddings, scales = self.quantize_int8(embeddings)
+        
+        return BatchEmbeddingResult(
+            embeddings=embeddings,
+            texts=list(texts),
+            model=self.model_name,
+            dimensions=self.output_dim,
+            scales=scales
         )
     
     def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Compute cosine similarity between two embeddings.
         
+        With normalize=True both inputs are assumed to be unit-norm (as
+        produced by this embedder), so the score is a plain dot product and
+        no norms are computed. Zero vectors still score 0.0.
+        
         Args:
             embedding1: First embedding vector
             embedding2: Second embedding vector
@@ -233,6 +781,37 @@ class LocalEmbedder:
         
         return float(np.dot(embedding1, embedding2) / (norm1 * norm2))
     
+    def similarity_batch(self, query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """
+        Compute cosine similarity between a query and many embeddings at once.
+        
+        Scores every row with a single matrix-vector product instead of a
+        Python loop over similarity(). With normalize=True the rows of
+        matrix are assumed to be unit-norm (as produced by this embedder).
+        
+        Args:
+            query: Query embedding vector of shape (dims,)
+            matrix: Embeddings of shape (n, dims)
+            
+        Returns:
+            Array of n cosine similarity scores (0.0 for zero vectors)
+        """
+        # float32 C-contiguous operands let NumPy dispatch to BLAS sgemv
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        query = np.ascontiguousarray(query, dtype=np.float32)
+        
+        if self.normalize:
+            return matrix @ self._normalize_embedding(query)
+        
+        # Otherwise compute full cosine similarity. einsum reduces each row's
+        # sum of squares without materializing a matrix-sized temporary
+        row_norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+        denominators = row_norms * np.linalg.norm(query)
+        dots = matrix @ query
+        scores = np.zeros_like(dots)
+        np.divide(dots, denominators, out=scores, where=denominators > 0)
+        return scores
+    
     def get_model_info(self) -> dict:
         """
         Get information about the loaded model.
@@ -242,12 +821,16 @@ class LocalEmbedder:
         """
         return {
             "model_name": self.model_name,
-            "dimensions": self.EMBEDDING_DIM,
+            "dimensions": self.output_dim,
+            "truncate_dim": self.truncate_dim,
             "device": self.device,
             "normalize": self.normalize,
+            "backend": self.backend,
+            "storage_dtype": self.storage_dtype,
             "loaded": self._model is not None
         }
     
     def unload_model(self):
         """Unload the model to free memory."""
-        self._model = None
+        with self._load_lock:
+            self._model = None
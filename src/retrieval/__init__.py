@@ -11,6 +11,7 @@ from .hybrid import (
     QueryPreprocessor,
     BM25Searcher,
 )
+from .semantic_cache import LSHCache
 
 __all__ = [
     "HybridRetriever",
@@ -18,4 +19,5 @@ __all__ = [
     "RetrievalConfig",
     "QueryPreprocessor",
     "BM25Searcher",
+    "LSHCache",
 ]
\ No newline at end of file
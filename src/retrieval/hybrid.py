@@ -5,16 +5,32 @@ Combines semantic (vector) search with BM25 keyword search for improved retrieva
 Uses configurable weights for score fusion and supports filtering by filing type and section.
 """
 
+import logging
 import re
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Set
 from datetime import date
 import numpy as np
+from scipy import sparse
 
-from rank_bm25 import BM25Okapi
+from .semantic_cache import LSHCache
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# PostgREST error code for an RPC function missing from the schema cache
+_MISSING_RPC_CODE = "PGRST202"
+
+# BM25 token pattern, applied to lowercased text
+_TOKEN_RE = re.compile(r'\b[a-z0-9]+\b')
+
+# Literal lookups (quoted phrase, bare ticker, filing item label) that are
+# answered by keyword search alone, without embedding the query
+_LITERAL_RE = re.compile(r'^(?:"[^"]+"|[A-Z]{1,5}|Item\s+\d+[A-Z]?)$')
+
+
+@dataclass(slots=True, frozen=True)
 class RetrievalResult:
     """Result from hybrid retrieval."""
     chunk_id: str
@@ -35,15 +51,33 @@ class RetrievalResult:
 
 @dataclass
 class RetrievalConfig:
-    """Configuration for hybrid retrieval."""
+    """
+    Configuration for hybrid retrieval.
+    
+    fusion selects how semantic and keyword scores are combined:
+    "weighted" (weighted sum of similarity and max-normalized BM25) or
+    "rrf" (Reciprocal Rank Fusion, which uses ranks only and ignores
+    the weights).
+    """
     semantic_weight: float = 0.7
     keyword_weight: float = 0.3
     max_results: int = 10
     days_back: int = 365
     min_score_threshold: float = 0.0
+    fusion: str = "weighted"
+    rrf_k: int = 60
+    
+    FUSION_METHODS = ("weighted", "rrf")
     
     def __post_init__(self):
-        """Validate weights sum to 1.0."""
+        """Validate fusion method and, for weighted fusion, that weights sum to 1.0."""
+        if self.fusion not in self.FUSION_METHODS:
+            raise ValueError(
+                f"fusion must be one of {', '.join(self.FUSION_METHODS)}, got {self.fusion}"
+            )
+        if self.fusion == "rrf":
+            return
+        
         total = self.semantic_weight + self.keyword_weight
         if abs(total - 1.0) > 0.001:
             raise ValueError(f"Weights must sum to 1.0, got {total}")
@@ -53,11 +87,11 @@ class QueryPreprocessor:
     """Preprocesses queries for improved retrieval."""
     
     # Financial domain stopwords to potentially remove
-    DOMAIN_STOPWORDS = {
+    DOMAIN_STOPWORDS = frozenset({
         "the", "a", "an", "is", "are", "was", "were", "be", "been",
         "being", "have", "has", "had", "do", "does", "did", "will",
         "would", "could", "should", "may", "might", "must", "shall",
-    }
+    })
     
     # Query expansion mappings for financial terms
     TERM_EXPANSIONS = {
@@ -100,7 +134,8 @@ class QueryPreprocessor:
         # Lowercase for matching
         query_lower = query.lower()
         
-        # Expand terms if enabled
+        # Expand terms if enabled. With ~10 terms, one C-level substring scan
+        # per term beats a combined regex or Aho-Corasick pass on short queries
         if self.expand_terms:
             expanded_terms = []
             for term, expansions in self.TERM_EXPANSIONS.items():
@@ -123,17 +158,51 @@ class QueryPreprocessor:
             List of tokens
         """
         # Simple tokenization: lowercase, split on non-alphanumeric
-        tokens = re.findall(r'\b[a-zA-Z0-9]+\b', text.lower())
+        tokens = _TOKEN_RE.findall(text.lower())
         
         # Remove stopwords if enabled
         if self.remove_stopwords:
             tokens = [t for t in tokens if t not in self.DOMAIN_STOPWORDS]
         
         return tokens
+    
+    def tokenize_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Tokenize many texts for BM25 indexing.
+        
+        Same tokens as tokenize(), with the per-call lookups hoisted out of
+        the loop.
+        
+        Args:
+            texts: Texts to tokenize
+            
+        Returns:
+            List of token lists, one per text
+        """
+        findall = _TOKEN_RE.findall
+        if not self.remove_stopwords:
+            return [findall(text.lower()) for text in texts]
+        
+        is_stopword = self.DOMAIN_STOPWORDS.__contains__
+        return [
+            [t for t in findall(text.lower()) if not is_stopword(t)]
+            for text in texts
+        ]
 
 
 class BM25Searcher:
-    """BM25 keyword search implementation."""
+    """
+    BM25 keyword search implementation.
+    
+    Scores with the Okapi BM25 formula (same parameters and IDF floor as
+    rank_bm25's BM25Okapi) over a sparse term-weight matrix, so a query is
+    one sparse matrix-vector product instead of a Python loop per document.
+    """
+    
+    K1 = 1.5
+    B = 0.75
+    # Negative IDFs (terms in over half the corpus) are floored to EPSILON * mean IDF
+    EPSILON = 0.25
     
     def __init__(self, preprocessor: Optional[QueryPreprocessor] = None):
         """
@@ -145,27 +214,175 @@ class BM25Searcher:
         self.preprocessor = preprocessor or QueryPreprocessor()
         self._corpus: List[str] = []
         self._corpus_ids: List[str] = []
-        self._bm25: Optional[BM25Okapi] = None
+        self._id_to_row: Dict[str, int] = {}
+        self._vocab: Dict[str, int] = {}
+        # Raw (n_docs, vocab_size) int32 term counts, document frequencies and lengths;
+        # kept so new documents can be appended without re-tokenizing the corpus
+        self._tf: Optional[sparse.csr_matrix] = None
+        self._doc_freqs = np.zeros(0, dtype=np.int64)
+        self._doc_lengths = np.zeros(0, dtype=np.float64)
+        # (n_docs, vocab_size) CSC matrix of IDF-weighted BM25 term scores,
+        # rebuilt from the counts on the next search after documents are added
+        self._bm25: Optional[sparse.csc_matrix] = None
+        self._weights_dirty = False
     
     def index_documents(self, documents: List[Dict[str, Any]]) -> None:
         """
-        Index documents for BM25 search.
+        Index documents for BM25 search, replacing any existing index.
         
         Args:
             documents: List of documents with 'id' and 'content' keys
         """
         self._corpus = []
         self._corpus_ids = []
-        tokenized_corpus = []
+        self._id_to_row = {}
+        self._vocab = {}
+        self._tf = None
+        self._doc_freqs = np.zeros(0, dtype=np.int64)
+        self._doc_lengths = np.zeros(0, dtype=np.float64)
+        self._bm25 = None
+        self._weights_dirty = False
+        
+        self.add_documents(documents)
+        self._ensure_weights()
+    
+    def add_documents(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Append documents to the existing index.
+        
+        Only the new documents are tokenized; term counts and document
+        frequencies are updated in place and the IDF-weighted matrix is
+        recomputed lazily on the next search.
         
-        for doc in documents:
+        Args:
+            documents: List of documents with 'id' and 'content' keys
+        """
+        if not documents:
+            return
+        
+        first_row = len(self._corpus)
+        new_contents = [doc["content"] for doc in documents]
+        for row, doc in enumerate(documents, start=first_row):
             self._corpus.append(doc["content"])
             self._corpus_ids.append(doc["id"])
-            tokens = self.preprocessor.tokenize(doc["content"])
-            tokenized_corpus.append(tokens)
+            self._id_to_row.setdefault(doc["id"], row)
+        
+        # One packed int32 term id per token occurrence; summing duplicates
+        # yields counts. Avoids a Python int object per token on large batches
+        token_cols = array("i")
+        indptr = array("q", [0])
+        vocab_setdefault = self._vocab.setdefault
+        for tokens in self.preprocessor.tokenize_batch(new_contents):
+            token_cols.extend(vocab_setdefault(token, len(self._vocab)) for token in tokens)
+            indptr.append(len(token_cols))
+        
+        vocab_size = len(self._vocab)
+        new_tf = sparse.csr_matrix(
+            (
+                np.ones(len(token_cols), dtype=np.int32),
+                np.frombuffer(token_cols, dtype=np.int32),
+                np.frombuffer(indptr, dtype=np.int64)
+            ),
+            shape=(len(documents), vocab_size)
+        )
+        new_tf.sum_duplicates()
+        
+        if self._tf is None:
+            self._tf = new_tf
+        else:
+            # Widen the existing rows to the grown vocabulary before stacking
+            self._tf.resize((self._tf.shape[0], vocab_size))
+            self._tf = sparse.vstack([self._tf, new_tf], format="csr")
+        
+        doc_freqs = np.zeros(vocab_size, dtype=np.int64)
+        doc_freqs[:len(self._doc_freqs)] = self._doc_freqs
+        self._doc_freqs = doc_freqs + np.bincount(new_tf.indices, minlength=vocab_size)
+        self._doc_lengths = np.concatenate(
+            [self._doc_lengths, np.diff(np.asarray(indptr, dtype=np.float64))]
+        )
+        self._weights_dirty = True
+    
+    def _ensure_weights(self) -> None:
+        """Rebuild the IDF-weighted term matrix if documents were added since."""
+        if not self._weights_dirty:
+            return
+        self._weights_dirty = False
+        
+        n_docs = len(self._corpus)
+        
+        # Okapi IDF
+        doc_freqs = self._doc_freqs
+        idf = np.log(n_docs - doc_freqs + 0.5) - np.log(doc_freqs + 0.5)
+        if idf.size:
+            idf[idf < 0] = self.EPSILON * idf.mean()
+        
+        # Length-normalized term saturation, applied to the nonzeros only
+        lengths = self._doc_lengths
+        avgdl = lengths.mean() if lengths.sum() > 0 else 1.0
+        norms = self.K1 * (1 - self.B + self.B * lengths / avgdl)
+        tf = self._tf.astype(np.float64)
+        row_norms = np.repeat(norms, np.diff(tf.indptr))
+        tf.data = tf.data * (self.K1 + 1) / (tf.data + row_norms)
+        
+        self._bm25 = sparse.csc_matrix(tf.multiply(idf).tocsr())
+        self._bm25.sort_indices()
+    
+    def _query_vector(self, query_tokens: List[str]) -> Optional[tuple]:
+        """Map query tokens to (vocab columns, counts), or None if none are indexed."""
+        counts = Counter(t for t in query_tokens if t in self._vocab)
+        if not counts:
+            return None
+        cols = np.fromiter((self._vocab[t] for t in counts), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return cols, weights
+    
+    def _get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        """Score every indexed document against tokenized query."""
+        query = self._query_vector(query_tokens)
+        if query is None:
+            return np.zeros(len(self._corpus_ids))
+        cols, weights = query
+        
+        # Walk the query terms' posting lists (CSC columns) directly and
+        # scatter-add their weighted scores; avoids building a column slice
+        indptr, indices, data = self._bm25.indptr, self._bm25.indices, self._bm25.data
+        postings = [slice(indptr[col], indptr[col + 1]) for col in cols]
+        docs = np.concatenate([indices[p] for p in postings])
+        contributions = np.concatenate([data[p] * w for p, w in zip(postings, weights)])
+        return np.bincount(docs, weights=contributions, minlength=len(self._corpus_ids))
+    
+    def batch_scores(self, queries: List[str]) -> np.ndarray:
+        """
+        Score every indexed document against several queries at once.
+        
+        Builds one sparse (n_queries, vocab_size) query-term matrix and
+        multiplies it against the term-weight matrix in a single call.
         
-        if tokenized_corpus:
-            self._bm25 = BM25Okapi(tokenized_corpus)
+        Args:
+            queries: Search queries
+            
+        Returns:
+            Array of shape (n_queries, n_documents) with BM25 scores
+        """
+        self._ensure_weights()
+        if self._bm25 is None or not self._corpus:
+            return np.zeros((len(queries), len(self._corpus_ids)))
+        
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, query in enumerate(queries):
+            for token in self.preprocessor.tokenize(query):
+                col = self._vocab.get(token)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        
+        # Duplicate (row, col) entries are summed, giving query term counts
+        query_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(queries), len(self._vocab))
+        )
+        return (query_matrix @ self._bm25.T).toarray()
     
     def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
         """
@@ -178,7 +395,8 @@ class BM25Searcher:
         Returns:
             List of results with id and score
         """
-        if not self._bm25 or not self._corpus:
+        self._ensure_weights()
+        if self._bm25 is None or not self._corpus:
             return []
         
         # Tokenize query
@@ -188,7 +406,7 @@ class BM25Searcher:
             return []
         
         # Get BM25 scores
-        scores = self._bm25.get_scores(query_tokens)
+        scores = self._get_scores(query_tokens)
         
         # Get top-k indices
         top_indices = np.argsort(scores)[::-1][:top_k]
@@ -215,16 +433,30 @@ class BM25Searcher:
         Returns:
             BM25 score (0.0 if not found)
         """
-        if not self._bm25 or doc_id not in self._corpus_ids:
+        self._ensure_weights()
+        if self._bm25 is None or doc_id not in self._id_to_row:
             return 0.0
         
         query_tokens = self.preprocessor.tokenize(query)
         if not query_tokens:
             return 0.0
         
-        idx = self._corpus_ids.index(doc_id)
-        scores = self._bm25.get_scores(query_tokens)
-        return float(scores[idx])
+        query = self._query_vector(query_tokens)
+        if query is None:
+            return 0.0
+        
+        # Binary-search the document in each query term's sorted posting list
+        cols, weights = query
+        row = self._id_to_row[doc_id]
+        indptr, indices, data = self._bm25.indptr, self._bm25.indices, self._bm25.data
+        
+        score = 0.0
+        for col, weight in zip(cols, weights):
+            start, end = indptr[col], indptr[col + 1]
+            pos = start + np.searchsorted(indices[start:end], row)
+            if pos < end and indices[pos] == row:
+                score += data[pos] * weight
+        return float(score)
 
 
 class HybridRetriever:
@@ -235,11 +467,24 @@ class HybridRetriever:
     vector similarity scores with BM25 keyword scores.
     """
     
+    # Default risk aspects for safety analysis
+    DEFAULT_SAFETY_ASPECTS = (
+        "litigation risks and legal proceedings",
+        "regulatory risks and compliance issues",
+        "financial risks and debt obligations",
+        "competitive risks and market position",
+        "operational risks and supply chain",
+        "cybersecurity and data privacy risks",
+    )
+    # Max aspect embeddings memoized (bounds memory for caller-supplied aspects)
+    ASPECT_CACHE_SIZE = 64
+    
     def __init__(
         self,
         store=None,
         embedder=None,
-        config: Optional[RetrievalConfig] = None
+        config: Optional[RetrievalConfig] = None,
+        cache: Optional[LSHCache] = None
     ):
         """
         Initialize hybrid retriever.
@@ -248,12 +493,24 @@ class HybridRetriever:
             store: SupabaseStore instance for vector search
             embedder: LocalEmbedder instance for query embedding
             config: Retrieval configuration
+            cache: Optional semantic cache; retrieve() returns cached results
+                for queries whose embeddings are near-duplicates of earlier ones
+                
+        Raises:
+            ValueError: If cache.dim does not match the embedder's output_dim
         """
+        output_dim = getattr(embedder, "output_dim", None)
+        if cache is not None and output_dim is not None and cache.dim != output_dim:
+            raise ValueError(
+                f"cache dim ({cache.dim}) must match embedder output_dim ({output_dim})"
+            )
         self._store = store
         self._embedder = embedder
         self.config = config or RetrievalConfig()
+        self.cache = cache
         self.preprocessor = QueryPreprocessor()
         self.bm25_searcher = BM25Searcher(self.preprocessor)
+        self._aspect_embed_cache: Dict[str, np.ndarray] = {}
     
     @property
     def store(self):
@@ -297,12 +554,33 @@ class HybridRetriever:
         max_results = max_results or self.config.max_results
         days_back = days_back or self.config.days_back
         
+        # Literal lookups gain nothing from an embedding; skip the model
+        if _LITERAL_RE.match(query.strip()) and getattr(self.store, "supports_keyword_search", False):
+            results = self._keyword_only_search(
+                query, ticker, filing_types, section_names, max_results, days_back
+            )
+            if results is not None:
+                return results
+        
         # Preprocess query
         processed_query = self.preprocessor.preprocess(query)
         
         # Step 1: Semantic search via vector similarity
         query_embedding = self.embedder.embed_query(processed_query)
         
+        # Near-duplicate queries with identical filters reuse cached results
+        cache_key = (
+            ticker,
+            tuple(filing_types or ()),
+            tuple(section_names or ()),
+            max_results,
+            days_back,
+        )
+        if self.cache is not None:
+            cached = self.cache.get(query_embedding, key=cache_key)
+            if cached is not None:
+                return list(cached)
+        
         # Fetch more results for reranking
         fetch_count = max_results * 3
         
@@ -318,6 +596,12 @@ class HybridRetriever:
         if not semantic_results:
             return []
         
+        # Skip BM25 entirely when no candidate can reach the threshold,
+        # even with a perfect keyword score
+        pool = self._build_pool(semantic_results)
+        if not self._can_reach_threshold(pool["similarity"]):
+            return []
+        
         # Step 2: Build BM25 index from semantic results
         documents = [
             {"id": r.id, "content": r.content}
@@ -325,43 +609,72 @@ class HybridRetriever:
         ]
         self.bm25_searcher.index_documents(documents)
         
-        # Step 3: Get BM25 scores for the query
-        bm25_results = self.bm25_searcher.search(query, top_k=len(documents))
-        bm25_scores = {r["id"]: r["score"] for r in bm25_results}
+        # Step 3: Get BM25 scores for the query, one per semantic result
+        keyword_scores = self.bm25_searcher.batch_scores([query])[0]
         
-        # Normalize BM25 scores to 0-1 range
-        if bm25_scores:
-            max_bm25 = max(bm25_scores.values()) if bm25_scores.values() else 1.0
-            if max_bm25 > 0:
-                bm25_scores = {k: v / max_bm25 for k, v in bm25_scores.items()}
+        # Step 4: Combine scores, rank and limit results
+        results = self._combine_scores(
+            semantic_results, keyword_scores, ticker, max_results, pool=pool
+        )
         
-        # Step 4: Combine scores and create results
-        results = []
-        for sr in semantic_results:
-            semantic_score = sr.similarity
-            keyword_score = bm25_scores.get(sr.id, 0.0)
+        if self.cache is not None:
+            self.cache.put(query_embedding, tuple(results), key=cache_key)
+        
+        return results
+    
+    def _keyword_only_search(
+        self,
+        query: str,
+        ticker: str,
+        filing_types: Optional[List[str]],
+        section_names: Optional[List[str]],
+        max_results: int,
+        days_back: int
+    ) -> Optional[List[RetrievalResult]]:
+        """
+        Retrieve by full-text candidates and BM25 alone, without embedding.
+        
+        Quoted queries are passed through as-is, so the store matches them
+        as exact phrases.
+        
+        Args:
+            query: Literal search query
+            ticker: Stock ticker to search
+            filing_types: Optional list of filing types to filter
+            section_names: Optional list of section names to filter
+            max_results: Maximum results to return
+            days_back: How far back to search
             
-            combined_score = (
-                self.config.semantic_weight * semantic_score +
-                self.config.keyword_weight * keyword_score
+        Returns:
+            List of retrieval results ranked by keyword score, or None if
+            the full-text RPC failed and the caller should search by vector
+        """
+        try:
+            candidates = self.store.keyword_search(
+                query=query.strip(),
+                ticker=ticker,
+                match_count=max_results * 3,
+                days_back=days_back,
+                filing_types=filing_types,
+                section_names=section_names,
             )
-            
-            if combined_score >= self.config.min_score_threshold:
-                results.append(RetrievalResult(
-                    chunk_id=sr.id,
-                    content=sr.content,
-                    section_name=sr.section_name,
-                    filing_type=sr.filing_type,
-                    filing_date=sr.filing_date,
-                    ticker=ticker,
-                    semantic_score=semantic_score,
-                    keyword_score=keyword_score,
-                    combined_score=combined_score,
-                ))
-        
-        # Step 5: Sort by combined score and limit results
-        results.sort(key=lambda x: x.combined_score, reverse=True)
-        return results[:max_results]
+        except Exception as e:
+            logger.warning(f"Keyword search failed, using vector search: {e}")
+            if getattr(e, "code", None) == _MISSING_RPC_CODE:
+                self.store.supports_keyword_search = False
+            return None
+        
+        if not candidates:
+            return []
+        
+        self.bm25_searcher.index_documents(
+            [{"id": r.id, "content": r.content} for r in candidates]
+        )
+        keyword_scores = self.bm25_searcher.batch_scores([query])[0]
+        
+        return self._combine_scores(
+            candidates, keyword_scores, ticker, max_results, keyword_only=True
+        )
     
     def retrieve_for_safety_check(
         self,
@@ -382,33 +695,55 @@ class HybridRetriever:
         Returns:
             Deduplicated list of retrieval results from all aspects
         """
-        # Default risk aspects for safety analysis
         if query_aspects is None:
-            query_aspects = [
-                "litigation risks and legal proceedings",
-                "regulatory risks and compliance issues",
-                "financial risks and debt obligations",
-                "competitive risks and market position",
-                "operational risks and supply chain",
-                "cybersecurity and data privacy risks",
+            query_aspects = list(self.DEFAULT_SAFETY_ASPECTS)
+        
+        filing_types = ["10-K", "10-Q", "8-K"]  # Include all filing types
+        
+        # Semantic candidates per aspect
+        search_kwargs = dict(
+            ticker=ticker,
+            match_count=max_results_per_aspect * 3,
+            days_back=self.config.days_back,
+            filing_types=filing_types,
+            section_names=None,  # Don't filter by section - names vary by filing
+        )
+        query_embeddings = [self._embed_aspect(aspect) for aspect in query_aspects]
+        
+        # One round trip for all aspects when the store supports it
+        aspect_candidates = self._batch_vector_search(query_embeddings, search_kwargs)
+        if aspect_candidates is None:
+            aspect_candidates = [
+                self.store.vector_search(query_embedding=embedding, **search_kwargs) or []
+                for embedding in query_embeddings
             ]
         
+        # One BM25 index over the union of candidates, scored for all aspects at once
+        pool: Dict[str, Any] = {}
+        for candidates in aspect_candidates:
+            for sr in candidates:
+                pool.setdefault(sr.id, sr)
+        self.bm25_searcher.index_documents(
+            [{"id": chunk_id, "content": sr.content} for chunk_id, sr in pool.items()]
+        )
+        aspect_scores = self.bm25_searcher.batch_scores(query_aspects)
+        row_of = self.bm25_searcher._id_to_row
+        
         all_results: Dict[str, RetrievalResult] = {}
         
-        for aspect in query_aspects:
-            aspect_results = self.retrieve(
-                query=aspect,
-                ticker=ticker,
-                filing_types=["10-K", "10-Q", "8-K"],  # Include all filing types
-                section_names=None,  # Don't filter by section - names vary by filing
-                max_results=max_results_per_aspect,
+        for candidates, scores in zip(aspect_candidates, aspect_scores):
+            if not candidates:
+                continue
+            pool = self._build_pool(candidates)
+            keyword_scores = scores[[row_of[chunk_id] for chunk_id in pool["id"]]]
+            aspect_results = self._combine_scores(
+                candidates, keyword_scores, ticker, max_results_per_aspect, pool=pool
             )
             
             # Deduplicate by chunk_id, keeping highest score
             for result in aspect_results:
-                if result.chunk_id not in all_results:
-                    all_results[result.chunk_id] = result
-                elif result.combined_score > all_results[result.chunk_id].combined_score:
+                best = all_results.get(result.chunk_id)
+                if best is None or result.combined_score > best.combined_score:
                     all_results[result.chunk_id] = result
         
         # Sort by combined score
@@ -417,6 +752,189 @@ class HybridRetriever:
         
         return results
     
+    def _batch_vector_search(
+        self,
+        query_embeddings: List[np.ndarray],
+        search_kwargs: Dict[str, Any]
+    ) -> Optional[List[List[Any]]]:
+        """
+        Run all aspect searches through the store's batch RPC, if available.
+        
+        A database without match_chunks_batch (schema not re-applied) has
+        its flag cleared so later checks go straight to per-aspect search.
+        
+        Args:
+            query_embeddings: One embedding per aspect
+            search_kwargs: Filters shared by every aspect search
+            
+        Returns:
+            SearchResults per aspect, or None if the caller should fall back
+            to one vector_search per aspect
+        """
+        if not query_embeddings or not getattr(self.store, "supports_batch_search", False):
+            return None
+        
+        try:
+            return self.store.vector_search_batch(
+                query_embeddings=np.vstack(query_embeddings), **search_kwargs
+            )
+        except Exception as e:
+            logger.warning(f"Batch vector search failed, searching per aspect: {e}")
+            if getattr(e, "code", None) == _MISSING_RPC_CODE:
+                self.store.supports_batch_search = False
+            return None
+    
+    def _embed_aspect(self, aspect: str) -> np.ndarray:
+        """
+        Embed a safety-check aspect, memoizing the result.
+        
+        Aspects are a small, mostly fixed set, so each is embedded once
+        per retriever instead of on every safety check.
+        """
+        embedding = self._aspect_embed_cache.get(aspect)
+        if embedding is None:
+            embedding = self.embedder.embed_query(self.preprocessor.preprocess(aspect))
+            if len(self._aspect_embed_cache) < self.ASPECT_CACHE_SIZE:
+                self._aspect_embed_cache[aspect] = embedding
+        return embedding
+    
+    def _can_reach_threshold(self, similarity: np.ndarray) -> bool:
+        """
+        Check whether any candidate could reach min_score_threshold.
+        
+        With weighted fusion the normalized keyword score is at most 1, so the
+        best possible score is semantic_weight * similarity + keyword_weight.
+        Always True for RRF or a non-positive threshold.
+        
+        Args:
+            similarity: Similarity for each candidate, from _build_pool
+            
+        Returns:
+            False if keyword scoring can be skipped because nothing can pass
+        """
+        config = self.config
+        if config.fusion != "weighted" or config.min_score_threshold <= 0:
+            return True
+        
+        best = config.semantic_weight * similarity.max() + config.keyword_weight
+        return bool(best >= config.min_score_threshold)
+    
+    @staticmethod
+    def _build_pool(semantic_results: List[Any]) -> Dict[str, np.ndarray]:
+        """
+        Extract the candidate columns used for scoring in a single pass.
+        
+        Scoring and ranking work on these parallel arrays; SearchResult
+        objects are only revisited for the rows that survive.
+        
+        Args:
+            semantic_results: SearchResults from vector search
+            
+        Returns:
+            Dict with "id" (object array) and "similarity" (float64 array)
+        """
+        n = len(semantic_results)
+        ids = np.empty(n, dtype=object)
+        similarity = np.empty(n, dtype=np.float64)
+        for i, sr in enumerate(semantic_results):
+            ids[i] = sr.id
+            similarity[i] = sr.similarity
+        return {"id": ids, "similarity": similarity}
+    
+    def _combine_scores(
+        self,
+        semantic_results: List[Any],
+        keyword_scores: np.ndarray,
+        ticker: str,
+        max_results: int,
+        pool: Optional[Dict[str, np.ndarray]] = None,
+        keyword_only: bool = False
+    ) -> List[RetrievalResult]:
+        """
+        Fuse semantic and raw BM25 scores into ranked retrieval results.
+        
+        Args:
+            semantic_results: SearchResults from vector search
+            keyword_scores: Raw BM25 score for each semantic result
+            ticker: Stock ticker the results belong to
+            max_results: Maximum results to return
+            pool: Columns from _build_pool, if already extracted
+            keyword_only: Rank by normalized keyword score alone
+            
+        Returns:
+            Results above the score threshold, ranked by combined score
+        """
+        if pool is None:
+            pool = self._build_pool(semantic_results)
+        
+        # Read the config once per call; it is not mutated mid-retrieval
+        config = self.config
+        
+        # Normalize positive BM25 scores to 0-1 range
+        keyword_scores = np.maximum(keyword_scores, 0.0)
+        max_bm25 = keyword_scores.max() if len(keyword_scores) else 0.0
+        if max_bm25 > 0:
+            keyword_scores = keyword_scores / max_bm25
+        
+        semantic_scores = pool["similarity"]
+        if keyword_only:
+            combined_scores = keyword_scores
+        elif config.fusion == "rrf":
+            combined_scores = self._rrf_scores(semantic_scores, keyword_scores)
+        else:
+            combined_scores = (
+                config.semantic_weight * semantic_scores +
+                config.keyword_weight * keyword_scores
+            )
+        
+        # Rank candidates above the threshold; a stable sort keeps input
+        # order for ties, and objects are built only for the survivors
+        candidates = np.flatnonzero(combined_scores >= config.min_score_threshold)
+        ranked = candidates[np.argsort(-combined_scores[candidates], kind="stable")][:max_results]
+        
+        results = []
+        for idx in ranked:
+            sr = semantic_results[idx]
+            results.append(RetrievalResult(
+                chunk_id=sr.id,
+                content=sr.content,
+                section_name=sr.section_name,
+                filing_type=sr.filing_type,
+                filing_date=sr.filing_date,
+                ticker=ticker,
+                semantic_score=sr.similarity,
+                keyword_score=float(keyword_scores[idx]),
+                combined_score=float(combined_scores[idx]),
+            ))
+        
+        return results
+    
+    def _rrf_scores(self, semantic_scores: np.ndarray, keyword_scores: np.ndarray) -> np.ndarray:
+        """
+        Reciprocal Rank Fusion of semantic and keyword rankings.
+        
+        Each candidate scores 1 / (rrf_k + rank) per ranking it appears in
+        (ranks start at 1). Candidates without any keyword match are left
+        out of the keyword ranking.
+        
+        Args:
+            semantic_scores: Similarity for each candidate
+            keyword_scores: BM25 score for each candidate
+            
+        Returns:
+            Fused score for each candidate
+        """
+        rrf_k = self.config.rrf_k
+        n = len(semantic_scores)
+        
+        semantic_ranks = np.empty(n)
+        semantic_ranks[np.argsort(-semantic_scores, kind="stable")] = np.arange(1, n + 1)
+        keyword_ranks = np.empty(n)
+        keyword_ranks[np.argsort(-keyword_scores, kind="stable")] = np.arange(1, n + 1)
+        
+        keyword_terms = np.where(keyword_scores > 0, 1.0 / (rrf_k + keyword_ranks), 0.0)
+        return 1.0 / (rrf_k + semantic_ranks) + keyword_terms
+    
     def retrieve_by_section(
         self,
         query: str,
@@ -0,0 +1,151 @@
+"""
+Semantic Cache for Retrieval Results.
+
+Caches retrieval results keyed by query embedding. Lookups bucket embeddings
+with random-projection LSH and confirm hits with an exact cosine check, so
+near-duplicate queries skip the vector search and BM25 pipeline.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class LSHCache:
+    """
+    Approximate-match cache keyed by embedding vectors.
+    
+    Each of n_tables tables hashes an embedding to an n_bits signature from
+    the signs of random projections. A lookup probes the matching bucket in
+    every table and returns the most similar cached entry whose cosine
+    similarity reaches threshold.
+    """
+    
+    def __init__(
+        self,
+        dim: int = 384,
+        n_bits: int = 16,
+        n_tables: int = 8,
+        threshold: float = 0.95,
+        max_entries: int = 1024,
+        seed: int = 0
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            dim: Embedding dimensions; must match the embedder's output
+                (e.g. its truncate_dim), or get/put raise ValueError
+            n_bits: Signature bits per table (at most 63)
+            n_tables: Number of hash tables; more tables raise recall
+            threshold: Minimum cosine similarity for a hit (default: 0.95)
+            max_entries: Entries kept before the oldest is evicted
+            seed: Seed for the random projections
+        """
+        if not 0 < n_bits <= 63:
+            raise ValueError("n_bits must be between 1 and 63")
+        
+        self.dim = dim
+        self.n_bits = n_bits
+        self.n_tables = n_tables
+        self.threshold = threshold
+        self.max_entries = max_entries
+        
+        rng = np.random.default_rng(seed)
+        # (dim, n_tables * n_bits): one matmul hashes a vector for every table
+        self._planes = rng.standard_normal((dim, n_tables * n_bits)).astype(np.float32)
+        self._bit_values = np.left_shift(1, np.arange(n_bits, dtype=np.int64))
+        
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+        self._entries: "OrderedDict[int, Tuple[Hashable, np.ndarray, Tuple[int, ...], Any]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _prepare(self, embedding: np.ndarray) -> Tuple[np.ndarray, Tuple[int, ...]]:
+        """Get the unit-norm vector and per-table signatures for an embedding."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if vector.shape[0] != self.dim:
+            raise ValueError(
+                f"Embedding has {vector.shape[0]} dimensions, cache expects {self.dim}"
+            )
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        
+        bits = (vector @ self._planes > 0).reshape(self.n_tables, self.n_bits)
+        signatures = tuple(int(sig) for sig in bits @ self._bit_values)
+        return vector, signatures
+    
+    def get(self, embedding: np.ndarray, key: Hashable = None) -> Optional[Any]:
+        """
+        Look up a cached value for a similar embedding.
+        
+        Args:
+            embedding: Query embedding
+            key: Exact-match context (e.g. ticker and filters); entries
+                stored under a different key never match
+        
+        Returns:
+            Cached value of the most similar entry, or None on a miss
+        """
+        vector, signatures = self._prepare(embedding)
+        
+        with self._lock:
+            candidates = set()
+            for table, signature in zip(self._tables, signatures):
+                candidates.update(table.get(signature, ()))
+            
+            best_value = None
+            best_similarity = self.threshold
+            for entry_id in candidates:
+                entry_key, entry_vector, _, value = self._entries[entry_id]
+                if entry_key != key:
+                    continue
+                similarity = float(entry_vector @ vector)
+                if similarity >= best_similarity:
+                    best_similarity = similarity
+                    best_value = value
+            
+            return best_value
+    
+    def put(self, embedding: np.ndarray, value: Any, key: Hashable = None) -> None:
+        """
+        Cache a value under an embedding.
+        
+        Args:
+            embedding: Query embedding
+            value: Value to cache
+            key: Exact-match context the value belongs to
+        """
+        vector, signatures = self._prepare(embedding)
+        
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (key, vector, signatures, value)
+            for table, signature in zip(self._tables, signatures):
+                table.setdefault(signature, []).append(entry_id)
+            
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+    
+    def _evict_oldest(self) -> None:
+        """Remove the oldest entry from the entry map and its buckets."""
+        entry_id, (_, _, signatures, _) = self._entries.popitem(last=False)
+        for table, signature in zip(self._tables, signatures):
+            bucket = table[signature]
+            bucket.remove(entry_id)
+            if not bucket:
+                del table[signature]
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            for table in self._tables:
+                table.clear()
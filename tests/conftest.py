@@ -0,0 +1,54 @@
+"""
+Shared pytest configuration for the test suite.
+
+Imports the safety and data modules once up front so every test module
+that imports them afterwards hits the sys.modules cache, provides the
+shared ref_date / frozen_today fixtures, and adds the --runslow option:
+tests marked @pytest.mark.slow are skipped unless it is given.
+"""
+
+from datetime import date
+
+import pytest
+
+import src.data.store  # noqa: F401
+import src.safety.earnings  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def ref_date():
+    """Reference date used as 'today'; override or parametrize to change it."""
+    return date(2024, 1, 15)
+
+
+@pytest.fixture
+def frozen_today(monkeypatch, ref_date):
+    """Pin date.today() in the earnings module to ref_date and return it."""
+    
+    class _FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return cls(ref_date.year, ref_date.month, ref_date.day)
+    
+    monkeypatch.setattr("src.safety.earnings.date", _FrozenDate)
+    return ref_date
+
+
+def pytest_addoption(parser):
+    """Register the --runslow command line option."""
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run tests marked as slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow was given."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
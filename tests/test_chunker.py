@@ -4,8 +4,10 @@ Unit tests for Filing Chunker.
 Tests text chunking, sentence boundary detection, overlap, and metadata preservation.
 """
 
+import sys
 import pytest
-from src.data.chunker import FilingChunker, Chunk
+from unittest.mock import patch
+from src.data.chunker import FilingChunker, Chunk, _scan_boundaries
 
 
 class TestChunkerInitialization:
@@ -146,6 +148,28 @@ class TestSentenceBoundaries:
         chunks = chunker.chunk_text(text)
         
         assert len(chunks) >= 1
+    
+    def test_boundary_scan_reused_on_rechunk(self):
+        """Test that re-chunking the same text reuses the boundary scan."""
+        text = "Unique boundary cache sentence. " * 20
+        chunker = FilingChunker(chunk_size=100, chunk_overlap=20, min_chunk_size=10)
+        
+        with patch("src.data.chunker._scan_boundaries", wraps=_scan_boundaries) as scan:
+            first = chunker.chunk_text(text)
+            second = chunker.chunk_text(text)
+        
+        scan.assert_called_once()
+        assert [c.text for c in first] == [c.text for c in second]
+    
+    def test_boundary_cache_is_bounded_and_keyed_by_digest(self):
+        """Test that the boundary cache holds digests, not document text."""
+        chunker = FilingChunker(chunk_size=100, chunk_overlap=20, min_chunk_size=10)
+        
+        for i in range(FilingChunker.BOUNDARY_CACHE_SIZE + 2):
+            chunker.chunk_text(f"Document number {i} sentence. " * 10)
+        
+        assert len(chunker._boundary_cache) == FilingChunker.BOUNDARY_CACHE_SIZE
+        assert all(isinstance(key, bytes) and len(key) == 64 for key in chunker._boundary_cache)
 
 
 class TestChunkOverlap:
@@ -350,6 +374,52 @@ class TestChunkFiling:
         # Empty section should not produce chunks
         section_names = {c.metadata["section"] for c in chunks}
         assert "7" not in section_names
+    
+    def test_chunk_filing_shares_metadata_strings(self):
+        """Test that repeated metadata values are shared across chunks."""
+        sections = {
+            "1A": "Risk factors section content. Material risks are described here.",
+            "7": "Management discussion and analysis. Revenue grew significantly."
+        }
+        
+        chunks = self.chunker.chunk_filing(
+            sections=sections,
+            filing_type="".join(["10-", "K"]),
+            ticker="".join(["GO", "OGL"])
+        )
+        
+        assert len(chunks) >= 2
+        assert chunks[0].metadata["ticker"] is chunks[-1].metadata["ticker"]
+        assert chunks[0].metadata["ticker"] is sys.intern("GOOGL")
+        assert chunks[0].metadata["filing_type"] is sys.intern("10-K")
+
+
+class TestMetadataPooling:
+    """Tests for opt-in metadata dict pooling."""
+    
+    def test_pooling_disabled_by_default(self):
+        """Test that released chunks keep their metadata when pooling is off."""
+        chunker = FilingChunker(chunk_size=100, chunk_overlap=20, min_chunk_size=10)
+        chunks = chunker.chunk_text("Some content to chunk here.", metadata={"ticker": "AAPL"})
+        
+        chunker.release_chunks(chunks)
+        
+        assert chunks[0].metadata == {"ticker": "AAPL"}
+        assert chunker._meta_pool == []
+    
+    def test_released_metadata_is_reused(self):
+        """Test that released metadata dicts are reused for new chunks."""
+        chunker = FilingChunker(
+            chunk_size=100, chunk_overlap=20, min_chunk_size=10, pool_metadata=True
+        )
+        first = chunker.chunk_text("First content to chunk.", metadata={"ticker": "AAPL"})
+        released_meta = first[0].metadata
+        
+        chunker.release_chunks(first)
+        second = chunker.chunk_text("Second content to chunk.", metadata={"ticker": "MSFT"})
+        
+        assert second[0].metadata is released_meta
+        assert second[0].metadata == {"ticker": "MSFT"}
 
 
 class TestChunkDataclass:
@@ -392,6 +462,19 @@ class TestChunkDataclass:
         )
         
         assert chunk.metadata == {}
+    
+    def test_chunk_make_matches_constructor(self):
+        """Test that the _make fast path builds an equal Chunk."""
+        made = Chunk._make("Test content", 3, 10, 22, {"key": "value"})
+        
+        assert made == Chunk(
+            text="Test content",
+            chunk_index=3,
+            start_char=10,
+            end_char=22,
+            metadata={"key": "value"}
+        )
+        assert made.char_count == 12
 
 
 class TestEdgeCases:
@@ -1,4 +1,5 @@
 import os
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from src.data.supabase import SupabaseClient, get_supabase
@@ -11,7 +12,7 @@ def test_supabase_client_initialization(mock_create_client):
         "SUPABASE_KEY": "test-key"
     }):
         # Reset singleton
-        SupabaseClient._instance = None
+        SupabaseClient.reset()
         
         # Setup mock
         mock_instance = MagicMock()
@@ -26,7 +27,7 @@ def test_supabase_client_missing_env():
     """Test Supabase client raises error when env vars missing."""
     with patch.dict(os.environ, {}, clear=True):
         # Reset singleton
-        SupabaseClient._instance = None
+        SupabaseClient.reset()
         
         with pytest.raises(ValueError, match="SUPABASE_URL and SUPABASE_KEY must be set"):
             get_supabase()
@@ -38,7 +39,7 @@ def test_supabase_client_default_values():
         "SUPABASE_KEY": "your-anon-key-here"
     }):
         # Reset singleton
-        SupabaseClient._instance = None
+        SupabaseClient.reset()
         
         with pytest.raises(ValueError, match="SUPABASE_URL and SUPABASE_KEY must be set"):
             get_supabase()
@@ -51,7 +52,7 @@ def test_supabase_singleton(mock_create_client):
         "SUPABASE_KEY": "test-key"
     }):
         # Reset singleton
-        SupabaseClient._instance = None
+        SupabaseClient.reset()
         
         # Setup mock
         mock_instance = MagicMock()
@@ -63,3 +64,45 @@ def test_supabase_singleton(mock_create_client):
         assert client1 is client2
         # create_client should only be called once
         mock_create_client.assert_called_once()
+
+def test_create_client_imported_lazily():
+    """Test that the Supabase SDK factory is resolved on first use."""
+    import supabase
+    import src.data.supabase as supabase_module
+    
+    with patch.object(supabase_module, "create_client", None):
+        assert supabase_module._get_create_client() is supabase.create_client
+
+def test_supabase_client_placeholder_key():
+    """Test Supabase client raises error when only the key is a placeholder."""
+    with patch.dict(os.environ, {
+        "SUPABASE_URL": "https://example.supabase.co",
+        "SUPABASE_KEY": "your-anon-key-here"
+    }):
+        # Reset singleton
+        SupabaseClient.reset()
+        
+        with pytest.raises(ValueError, match="SUPABASE_URL and SUPABASE_KEY must be set"):
+            get_supabase()
+
+@patch("src.data.supabase.create_client")
+def test_supabase_client_per_thread(mock_create_client):
+    """Test that each thread gets its own Supabase client."""
+    with patch.dict(os.environ, {
+        "SUPABASE_URL": "https://example.supabase.co",
+        "SUPABASE_KEY": "test-key"
+    }):
+        # Reset singleton
+        SupabaseClient.reset()
+        
+        mock_create_client.side_effect = lambda url, key: MagicMock()
+        
+        main_client = get_supabase()
+        thread_clients = []
+        worker = threading.Thread(target=lambda: thread_clients.append(get_supabase()))
+        worker.start()
+        worker.join()
+        
+        assert get_supabase() is main_client
+        assert thread_clients[0] is not main_client
+        assert mock_create_client.call_count == 2
@@ -8,8 +8,12 @@ import pytest
 import numpy as np
 from unittest.mock import patch, MagicMock
 import sys
+import dataclasses
+import importlib.util
 
-from src.embeddings.embedder import LocalEmbedder, EmbeddingResult
+from src.embeddings.embedder import (
+    LocalEmbedder, EmbeddingResult, BatchEmbeddingResult, _OnnxEncoder
+)
 
 
 class TestLocalEmbedderInitialization:
@@ -124,6 +128,80 @@ class TestEmbedBatch:
         call_kwargs = mock_model.encode.call_args[1]
         assert call_kwargs['batch_size'] == 16
     
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_sorts_by_length(self, mock_st):
+        """Test that large batches are encoded length-sorted but returned in order."""
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [np.full(384, len(t), dtype=np.float32) for t in texts]
+        )
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(normalize=False)
+        texts = ["a" * n for n in (5, 1, 4, 2, 3)]
+        result = embedder.embed_batch(texts, batch_size=2)
+        
+        assert mock_model.encode.call_args[0][0] == ["a", "aa", "aaa", "aaaa", "aaaaa"]
+        assert [row[0] for row in result] == [5, 1, 4, 2, 3]
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_into_memmap(self, mock_st, tmp_path):
+        """Test that embeddings are written batch by batch into a memmap."""
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [np.full(384, len(t), dtype=np.float32) for t in texts]
+        )
+        mock_st.return_value = mock_model
+        
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        out = np.memmap(tmp_path / "emb.f32", dtype=np.float32, mode="w+", shape=(5, 384))
+        
+        embedder = LocalEmbedder(normalize=False)
+        result = embedder.embed_batch_into(texts, out, batch_size=2)
+        
+        assert result is out
+        assert mock_model.encode.call_count == 3
+        assert [row[0] for row in out] == [1, 2, 3, 4, 5]
+    
+    def test_embed_batch_into_rejects_bad_buffer(self):
+        """Test that mismatched shapes or dtypes are rejected."""
+        embedder = LocalEmbedder()
+        
+        with pytest.raises(ValueError, match="shape"):
+            embedder.embed_batch_into(["a"], np.zeros((2, 384), dtype=np.float32))
+        with pytest.raises(ValueError, match="float32"):
+            embedder.embed_batch_into(["a"], np.zeros((1, 384)))
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_reuses_released_buffer(self, mock_st):
+        """Test that released output buffers are reused and zeroed."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.ones((2, 384), dtype=np.float32)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder()
+        first = embedder.embed_batch(["First", "Second", ""], reuse_buffer=True)
+        embedder.release_buffer(first)
+        second = embedder.embed_batch(["Third", "", "Fourth"], reuse_buffer=True)
+        
+        assert second is first
+        assert second.dtype == np.float32
+        assert np.allclose(second[1], 0.0)
+        assert np.allclose(second[2], 1.0)
+    
+    @pytest.mark.parametrize("buffer", [
+        np.zeros((2, 128), dtype=np.float32),
+        np.zeros((2, 384), dtype=np.float64),
+        np.zeros((384, 2), dtype=np.float32).T,
+    ])
+    def test_release_buffer_rejects_mismatched_buffer(self, buffer):
+        """Test that buffers of the wrong width, dtype or layout are not pooled."""
+        embedder = LocalEmbedder()
+        
+        embedder.release_buffer(buffer)
+        
+        assert embedder._out_pool == {}
+    
     def test_embed_batch_empty_list(self):
         """Test that empty list returns empty array with correct shape."""
         embedder = LocalEmbedder()
@@ -166,6 +244,255 @@ class TestEmbedBatch:
         assert result.shape == (100, 384)
 
 
+class TestStorageDtype:
+    """Tests for half-precision embedding storage."""
+    
+    def test_invalid_storage_dtype_raises_error(self):
+        """Test that unsupported storage dtypes are rejected."""
+        with pytest.raises(ValueError, match="storage_dtype must be one of"):
+            LocalEmbedder(storage_dtype="int4")
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_float16_storage(self, mock_st):
+        """Test that float16 storage casts batch output, including empty rows."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(2, 384).astype(np.float32)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(storage_dtype="float16")
+        result = embedder.embed_batch(["Text one", "", "Text two"])
+        
+        assert result.dtype == np.float16
+        assert result.shape == (3, 384)
+        assert embedder.get_model_info()["storage_dtype"] == "float16"
+    
+    def test_normalize_float16_keeps_dtype(self):
+        """Test that half-precision vectors are normalized in float32 and cast back."""
+        embedder = LocalEmbedder()
+        
+        vec = np.array([3.0, 4.0] + [0.0] * 382, dtype=np.float16)
+        normalized = embedder._normalize_embedding(vec)
+        
+        assert normalized.dtype == np.float16
+        assert np.isclose(float(normalized[0]), 0.6, atol=1e-3)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("torch") is None, reason="torch not installed")
+class TestTorchConfiguration:
+    """Tests for PyTorch runtime configuration."""
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_load_model_sets_threads_and_eval(self, mock_st):
+        """Test that loading configures torch threads and eval mode."""
+        import torch
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        
+        with patch.object(torch, 'set_num_threads') as mock_threads:
+            LocalEmbedder().model
+        
+        mock_threads.assert_called_once()
+        mock_model.eval.assert_called_once()
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_encode_runs_in_inference_mode(self, mock_st):
+        """Test that encoding runs with autograd disabled."""
+        import torch
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda *args, **kwargs: np.array(
+            [float(torch.is_inference_mode_enabled())] * 384
+        )
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(normalize=False)
+        
+        assert embedder.embed_text("Apple revenue")[0] == 1.0
+
+
+class TestOnnxBackend:
+    """Tests for the ONNX Runtime backend."""
+    
+    def test_invalid_backend_raises(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError, match="backend"):
+            LocalEmbedder(backend="tensorrt")
+    
+    def test_onnx_backend_uses_onnx_loader(self):
+        """Test that backend='onnx' loads through the ONNX path."""
+        embedder = LocalEmbedder(backend="onnx")
+        
+        with patch.object(LocalEmbedder, '_load_onnx_model', return_value="ort") as mock_load:
+            assert embedder.model == "ort"
+        
+        mock_load.assert_called_once()
+        assert embedder.get_model_info()["backend"] == "onnx"
+    
+    def test_onnx_encoder_cls_pooling_and_normalization(self):
+        """Test that the ONNX encoder pools the CLS token and normalizes."""
+        hidden = np.zeros((2, 3, 384), dtype=np.float32)
+        hidden[0, 0, 0] = 3.0
+        hidden[1, 0, 1] = 4.0
+        hidden[:, 1:] = 9.0
+        mock_model = MagicMock(return_value=MagicMock(last_hidden_state=hidden))
+        mock_tokenizer = MagicMock(return_value={"input_ids": np.zeros((2, 3))})
+        
+        encoder = _OnnxEncoder(mock_model, mock_tokenizer)
+        result = encoder.encode(["a", "b"], normalize_embeddings=True)
+        
+        assert result.shape == (2, 384)
+        assert result[0, 0] == pytest.approx(1.0)
+        assert result[1, 1] == pytest.approx(1.0)
+        assert mock_tokenizer.call_args[1]["return_tensors"] == "np"
+    
+    def test_onnx_encoder_single_text_returns_vector(self):
+        """Test that encoding a single string returns a 1D vector."""
+        hidden = np.ones((1, 2, 384), dtype=np.float32)
+        mock_model = MagicMock(return_value=MagicMock(last_hidden_state=hidden))
+        
+        encoder = _OnnxEncoder(mock_model, MagicMock(return_value={}))
+        
+        assert encoder.encode("text").shape == (384,)
+
+
+class TestTruncateDim:
+    """Tests for Matryoshka dimension truncation."""
+    
+    def test_invalid_truncate_dim_raises(self):
+        """Test that out-of-range truncate_dim values are rejected."""
+        with pytest.raises(ValueError, match="truncate_dim"):
+            LocalEmbedder(truncate_dim=0)
+        with pytest.raises(ValueError, match="truncate_dim"):
+            LocalEmbedder(truncate_dim=512)
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_text_truncates_and_renormalizes(self, mock_st):
+        """Test that single embeddings are truncated to unit length."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.full(384, 1 / np.sqrt(384))
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(truncate_dim=128)
+        embedding = embedder.embed_text("Apple revenue")
+        
+        assert embedding.shape == (128,)
+        assert np.isclose(np.linalg.norm(embedding), 1.0)
+        assert embedder.get_model_info()["dimensions"] == 128
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_truncates(self, mock_st):
+        """Test that batch embeddings, including empty texts, use truncate_dim."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(2, 384)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(truncate_dim=256)
+        result = embedder.embed_batch(["First", "", "Second"])
+        
+        assert result.shape == (3, 256)
+        assert np.allclose(np.linalg.norm(result, axis=1), [1.0, 0.0, 1.0])
+
+
+class TestEmbeddingCache:
+    """Tests for the on-disk embedding cache."""
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_text_uses_cache(self, mock_st, tmp_path):
+        """Test that repeated text is served from the cache."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(384).astype(np.float32)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(embedding_cache_dir=tmp_path)
+        first = embedder.embed_text("Cached   text")
+        second = LocalEmbedder(embedding_cache_dir=tmp_path).embed_text("Cached text")
+        
+        mock_model.encode.assert_called_once()
+        assert np.array_equal(first, second)
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_encodes_only_uncached(self, mock_st, tmp_path):
+        """Test that embed_batch only encodes cache misses and keeps order."""
+        cached_vec = np.full(384, 0.5, dtype=np.float32)
+        new_vec = np.full(384, -0.5, dtype=np.float32)
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = [cached_vec, np.array([new_vec])]
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(embedding_cache_dir=tmp_path)
+        embedder.embed_text("Seen before")
+        result = embedder.embed_batch(["New text", "", "Seen before"])
+        
+        assert mock_model.encode.call_args[0][0] == ["New text"]
+        assert np.allclose(result[0], new_vec)
+        assert np.allclose(result[1], np.zeros(384))
+        assert np.allclose(result[2], cached_vec)
+    
+    def test_cache_key_depends_on_model(self, tmp_path):
+        """Test that different models do not share cache entries."""
+        first = LocalEmbedder(embedding_cache_dir=tmp_path)
+        second = LocalEmbedder(model_name="custom/model", embedding_cache_dir=tmp_path)
+        
+        assert first._cache_path("text") != second._cache_path("text")
+
+
+class TestQuantization:
+    """Tests for int8 embedding quantization."""
+    
+    def test_quantize_round_trip(self):
+        """Test that dequantized embeddings stay close to the originals."""
+        embeddings = np.random.randn(4, 384).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        
+        quantized, scales = LocalEmbedder.quantize_int8(embeddings)
+        restored = LocalEmbedder.dequantize(quantized, scales)
+        
+        assert quantized.dtype == np.int8
+        assert quantized.shape == (4, 384)
+        assert scales.shape == (4,)
+        assert np.allclose(restored, embeddings, atol=scales.max())
+    
+    def test_quantize_zero_vector(self):
+        """Test that zero vectors quantize to zeros without dividing by zero."""
+        quantized, scale = LocalEmbedder.quantize_int8(np.zeros(384))
+        
+        assert scale == 0.0
+        assert not quantized.any()
+        assert np.allclose(LocalEmbedder.dequantize(quantized, scale), np.zeros(384))
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_with_metadata_quantized(self, mock_st):
+        """Test that embed_with_metadata can return an int8 embedding with scale."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(384).astype(np.float32)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder()
+        result = embedder.embed_with_metadata("Test text", quantize=True)
+        
+        assert result.embedding.dtype == np.int8
+        assert result.scale > 0
+    
+    def test_normalize_int8_embedding(self):
+        """Test that int8 embeddings normalize without a scale."""
+        embedder = LocalEmbedder()
+        
+        quantized = np.array([30, 40] + [0] * 382, dtype=np.int8)
+        normalized = embedder._normalize_embedding(quantized)
+        
+        assert np.isclose(normalized[0], 0.6)
+        assert np.isclose(normalized[1], 0.8)
+    
+    @pytest.mark.parametrize("dtype", [np.int64, np.int32])
+    def test_normalize_integer_embedding_returns_float(self, dtype):
+        """Test that wider integer vectors are normalized as float32, not truncated."""
+        embedder = LocalEmbedder()
+        
+        normalized = embedder._normalize_embedding(np.array([3, 4], dtype=dtype))
+        
+        assert normalized.dtype == np.float32
+        assert np.allclose(normalized, [0.6, 0.8])
+
+
 class TestEmbedQuery:
     """Tests for query embedding with instruction prefix."""
     
@@ -181,6 +508,7 @@ class TestEmbedQuery:
         
         call_args = mock_model.encode.call_args[0][0]
         assert call_args.startswith("Represent this sentence for searching relevant passages:")
+        assert call_args.startswith(LocalEmbedder.QUERY_PREFIX)
         assert "risk factors" in call_args
     
     @patch('sentence_transformers.SentenceTransformer')
@@ -202,6 +530,19 @@ class TestEmbedQuery:
         result = embedder.embed_query("")
         
         assert np.allclose(result, np.zeros(384))
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_query_ignores_storage_dtype(self, mock_st):
+        """Test that queries stay float32 while stored embeddings use storage_dtype."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.ones(384, dtype=np.float32)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder(storage_dtype="float16")
+        
+        assert embedder.embed_query("Search query").dtype == np.float32
+        assert embedder.embed_query("").dtype == np.float32
+        assert embedder.embed_text("Stored text").dtype == np.float16
 
 
 class TestSimilarity:
@@ -266,6 +607,40 @@ class TestSimilarity:
         assert np.isclose(similarity, 1.0)
 
 
+class TestSimilarityBatch:
+    """Tests for batched similarity computation."""
+    
+    def test_similarity_batch_matches_pairwise(self):
+        """Test that batched scores equal pairwise similarity for unit vectors."""
+        embedder = LocalEmbedder(normalize=True)
+        
+        matrix = np.random.randn(10, 384)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query = matrix[3]
+        
+        scores = embedder.similarity_batch(query, matrix)
+        
+        assert scores.shape == (10,)
+        assert scores.dtype == np.float32
+        expected = [embedder.similarity(query, row) for row in matrix]
+        assert np.allclose(scores, expected, atol=1e-5)
+        assert np.isclose(scores[3], 1.0, atol=1e-5)
+    
+    def test_similarity_batch_unnormalized_with_zero_row(self):
+        """Test unnormalized batched scores and zero-vector handling."""
+        embedder = LocalEmbedder(normalize=False)
+        
+        query = np.array([1.0, 0.0] + [0.0] * 382)
+        matrix = np.zeros((3, 384))
+        matrix[0, 0] = 2.0   # Same direction
+        matrix[1, 0] = -3.0  # Opposite direction
+        # matrix[2] stays a zero vector
+        
+        scores = embedder.similarity_batch(query, matrix)
+        
+        assert np.allclose(scores, [1.0, -1.0, 0.0])
+
+
 class TestEmbedWithMetadata:
     """Tests for embedding with metadata."""
     
@@ -285,6 +660,37 @@ class TestEmbedWithMetadata:
         assert result.dimensions == 384
         assert result.embedding.shape == (384,)
 
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_with_metadata_returns_matrix(self, mock_st):
+        """Test that batch metadata results share one contiguous matrix."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(2, 384)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder()
+        result = embedder.embed_batch_with_metadata(["First", "Second"])
+        
+        assert isinstance(result, BatchEmbeddingResult)
+        assert len(result) == 2
+        assert result.embeddings.shape == (2, 384)
+        assert result.embeddings.flags['C_CONTIGUOUS']
+        assert result.row(1).text == "Second"
+        assert np.array_equal(result.row(1).embedding, result.embeddings[1])
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_embed_batch_with_metadata_quantized(self, mock_st):
+        """Test that quantized batch results carry per-row scales."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.randn(2, 384)
+        mock_st.return_value = mock_model
+        
+        embedder = LocalEmbedder()
+        result = embedder.embed_batch_with_metadata(["First", "Second"], quantize=True)
+        
+        assert result.embeddings.dtype == np.int8
+        assert result.scales.shape == (2,)
+        assert result.row(0).scale == pytest.approx(result.scales[0])
 
 class TestModelInfo:
     """Tests for model information."""
@@ -364,6 +770,30 @@ class TestNormalization:
         assert np.isclose(normalized[0], 0.6)
         assert np.isclose(normalized[1], 0.8)
     
+    def test_normalize_embedding_matrix(self):
+        """Test that each row of a matrix is normalized independently."""
+        embedder = LocalEmbedder()
+        
+        matrix = np.zeros((3, 384))
+        matrix[0, :2] = [3.0, 4.0]
+        matrix[2, 5] = 2.0
+        normalized = embedder._normalize_embedding(matrix)
+        
+        assert normalized.shape == (3, 384)
+        assert np.allclose(normalized[0, :2], [0.6, 0.8])
+        assert np.allclose(normalized[1], 0.0)
+        assert np.isclose(normalized[2, 5], 1.0)
+    
+    def test_normalize_float32_vector_keeps_dtype(self):
+        """Test that the single-vector fast path preserves float32."""
+        embedder = LocalEmbedder()
+        
+        vec = np.array([3.0, 4.0] + [0.0] * 382, dtype=np.float32)
+        normalized = embedder._normalize_embedding(vec)
+        
+        assert normalized.dtype == np.float32
+        assert np.isclose(np.linalg.norm(normalized), 1.0)
+    
     def test_normalize_zero_vector(self):
         """Test normalizing zero vector returns zero vector."""
         embedder = LocalEmbedder()
@@ -387,6 +817,14 @@ class TestTextPreparation:
         assert "  " not in prepared
         assert "\n" not in prepared
         assert "\t" not in prepared
+    
+    def test_prepare_text_handles_all_whitespace_controls(self):
+        """Test that carriage returns, vertical tabs and form feeds collapse too."""
+        embedder = LocalEmbedder()
+        
+        prepared = embedder._prepare_text("  Item 1A.\r\n\x0bRisk\x0c\tFactors  ")
+        
+        assert prepared == "Item 1A. Risk Factors"
 
 
 class TestEmbeddingResult:
@@ -407,6 +845,52 @@ class TestEmbeddingResult:
         assert result.model == "test-model"
         assert result.dimensions == 384
 
+    
+    def test_embedding_result_is_slotted_and_frozen(self):
+        """Test that EmbeddingResult has no instance dict and rejects assignment."""
+        result = EmbeddingResult(
+            embedding=np.zeros(384),
+            text="Sample text",
+            model="test-model",
+            dimensions=384
+        )
+        
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.text = "Other text"
+    
+    def test_embedding_result_bytes_round_trip(self):
+        """Test that to_bytes/from_bytes preserve the embedding and metadata."""
+        result = EmbeddingResult(
+            embedding=np.random.randn(384).astype(np.float32),
+            text="Revenue grew 8% — driven by services",
+            model="test-model",
+            dimensions=384
+        )
+        
+        restored = EmbeddingResult.from_bytes(result.to_bytes())
+        
+        assert np.array_equal(restored.embedding, result.embedding)
+        assert restored.embedding.dtype == np.float32
+        assert restored.text == result.text
+        assert restored.model == result.model
+        assert restored.scale is None
+    
+    def test_embedding_result_bytes_keeps_int8_scale(self):
+        """Test that quantized results round-trip with their scale."""
+        quantized, scale = LocalEmbedder.quantize_int8(np.random.randn(384))
+        result = EmbeddingResult(quantized, "text", "test-model", 384, scale)
+        
+        restored = EmbeddingResult.from_bytes(result.to_bytes())
+        
+        assert restored.embedding.dtype == np.int8
+        assert np.array_equal(restored.embedding, quantized)
+        assert restored.scale == pytest.approx(scale)
+    
+    def test_embedding_result_from_bytes_rejects_garbage(self):
+        """Test that records without the magic header are rejected."""
+        with pytest.raises(ValueError):
+            EmbeddingResult.from_bytes(b"\0" * 64)
 
 class TestLazyLoading:
     """Tests for lazy model loading."""
@@ -444,3 +928,24 @@ class TestLazyLoading:
         
         # Model should only be instantiated once
         mock_st.assert_called_once()
+    
+    @patch('sentence_transformers.SentenceTransformer')
+    def test_model_loaded_once_under_concurrency(self, mock_st):
+        """Test that concurrent first requests share a single model load."""
+        import threading
+        import time
+        
+        def slow_load(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+        
+        mock_st.side_effect = slow_load
+        embedder = LocalEmbedder()
+        
+        threads = [threading.Thread(target=lambda: embedder.model) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        mock_st.assert_called_once()
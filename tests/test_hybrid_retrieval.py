@@ -11,8 +11,10 @@ Tests cover:
 """
 
 import pytest
+from dataclasses import dataclass, field
 from datetime import date
-from unittest.mock import MagicMock, patch
+from typing import Any, Dict, List
+from unittest.mock import patch
 import numpy as np
 
 from src.retrieval.hybrid import (
@@ -22,7 +24,61 @@ from src.retrieval.hybrid import (
     QueryPreprocessor,
     BM25Searcher,
 )
+from src.retrieval.semantic_cache import LSHCache
 from src.data.store import SearchResult
+from src.embeddings.embedder import LocalEmbedder
+
+
+@pytest.fixture(scope="session")
+def fake_embedding():
+    """Deterministic query embedding shared by every test."""
+    return np.linspace(0, 1, 384, dtype=np.float32)
+
+
+@dataclass
+class FakeStore:
+    """Vector store stand-in that records searches and returns canned results."""
+    
+    results: List[SearchResult] = field(default_factory=list)
+    # Per-call results, consumed in order before falling back to results
+    queued: List[List[SearchResult]] = field(default_factory=list)
+    calls: List[Dict[str, Any]] = field(default_factory=list)
+    keyword_calls: List[Dict[str, Any]] = field(default_factory=list)
+    supports_keyword_search: bool = True
+    
+    def vector_search(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.queued:
+            return self.queued.pop(0)
+        return self.results
+    
+    def keyword_search(self, **kwargs):
+        self.keyword_calls.append(kwargs)
+        return self.results
+
+
+@dataclass
+class FakeEmbedder:
+    """Embedder stand-in that records queries and returns a fixed embedding."""
+    
+    embedding: np.ndarray
+    queries: List[str] = field(default_factory=list)
+    
+    def embed_query(self, query):
+        self.queries.append(query)
+        return self.embedding
+
+
+@pytest.fixture
+def mock_store():
+    """Fake store with no results."""
+    return FakeStore()
+
+
+@pytest.fixture
+def mock_embedder(fake_embedding):
+    """Fake embedder returning the shared fake embedding."""
+    return FakeEmbedder(fake_embedding)
 
 
 class TestRetrievalConfig:
@@ -63,6 +119,18 @@ class TestRetrievalConfig:
         config = RetrievalConfig(semantic_weight=0.7001, keyword_weight=0.2999)
         assert config is not None
 
+    
+    def test_rrf_skips_weight_validation(self):
+        """Test that RRF fusion does not require weights to sum to 1.0."""
+        config = RetrievalConfig(semantic_weight=0.9, keyword_weight=0.9, fusion="rrf")
+        
+        assert config.fusion == "rrf"
+        assert config.rrf_k == 60
+    
+    def test_invalid_fusion_raises(self):
+        """Test that unknown fusion methods are rejected."""
+        with pytest.raises(ValueError, match="fusion"):
+            RetrievalConfig(fusion="max")
 
 class TestQueryPreprocessor:
     """Tests for QueryPreprocessor."""
@@ -91,6 +159,17 @@ class TestQueryPreprocessor:
         # Should contain expansions
         assert "lawsuit" in result or "legal proceedings" in result
     
+    def test_preprocess_expands_multiple_terms_in_table_order(self):
+        """Test that every matched term (including phrases) expands in table order."""
+        preprocessor = QueryPreprocessor(expand_terms=True)
+        
+        result = preprocessor.preprocess("Supply chain and litigation risk")
+        
+        assert result == (
+            "Supply chain and litigation risk "
+            "risks risk factors lawsuit legal proceedings suppliers supply disruption"
+        )
+    
     def test_preprocess_no_expansion(self):
         """Test with term expansion disabled."""
         preprocessor = QueryPreprocessor(expand_terms=False)
@@ -132,6 +211,19 @@ class TestQueryPreprocessor:
         assert "factors" in tokens
         assert "10" in tokens
         assert "k" in tokens
+    
+    @pytest.mark.parametrize("remove_stopwords", [False, True])
+    def test_tokenize_batch_matches_tokenize(self, remove_stopwords):
+        """Test that batch tokenization yields the same tokens as tokenize."""
+        preprocessor = QueryPreprocessor(remove_stopwords=remove_stopwords)
+        texts = [
+            "Item 1A: Risk Factors (10-K)",
+            "The company IS facing risks",
+            "snake_case and café stay unsplit",
+            "",
+        ]
+        
+        assert preprocessor.tokenize_batch(texts) == [preprocessor.tokenize(t) for t in texts]
 
 
 class TestBM25Searcher:
@@ -161,6 +253,62 @@ class TestBM25Searcher:
         assert len(searcher._corpus_ids) == 3
         assert searcher._bm25 is not None
     
+    def test_add_documents_incremental(self):
+        """Test appending documents matches indexing the whole corpus at once."""
+        documents = [
+            {"id": "doc1", "content": "Apple faces litigation risks"},
+            {"id": "doc2", "content": "Microsoft revenue growth"},
+            {"id": "doc3", "content": "Legal proceedings against company"},
+            {"id": "doc4", "content": "Litigation over patent infringement claims"},
+            {"id": "doc5", "content": "Revenue declined amid regulatory risks"},
+        ]
+        
+        full = BM25Searcher()
+        full.index_documents(documents)
+        
+        incremental = BM25Searcher()
+        incremental.index_documents(documents[:2])
+        incremental.add_documents(documents[2:4])
+        incremental.add_documents(documents[4:])
+        
+        assert incremental._corpus_ids == full._corpus_ids
+        np.testing.assert_array_equal(incremental._doc_freqs, full._doc_freqs)
+        
+        queries = ["litigation risks", "revenue growth", "patent claims"]
+        np.testing.assert_allclose(
+            incremental.batch_scores(queries), full.batch_scores(queries)
+        )
+        assert incremental.search("litigation") == full.search("litigation")
+        assert incremental.get_score("patent", "doc4") == pytest.approx(
+            full.get_score("patent", "doc4")
+        )
+    
+    def test_term_counts_are_packed_int32(self):
+        """Test that term counts and ids are stored as compact int32 arrays."""
+        searcher = BM25Searcher()
+        searcher.index_documents([
+            {"id": "doc1", "content": "risk risk litigation"},
+            {"id": "doc2", "content": "revenue growth"},
+        ])
+        
+        assert searcher._tf.dtype == np.int32
+        assert searcher._tf.indices.dtype == np.int32
+        risk = searcher._vocab["risk"]
+        assert searcher._tf[0, risk] == 2
+    
+    def test_add_documents_to_empty_index(self):
+        """Test add_documents works without a prior index_documents call."""
+        searcher = BM25Searcher()
+        searcher.add_documents([
+            {"id": "doc1", "content": "Apple faces litigation risks"},
+            {"id": "doc2", "content": "Microsoft revenue growth"},
+            {"id": "doc3", "content": "Legal proceedings against company"},
+        ])
+        
+        results = searcher.search("litigation")
+        
+        assert [r["id"] for r in results] == ["doc1"]
+    
     def test_search_returns_relevant_results(self):
         """Test search returns relevant documents."""
         searcher = BM25Searcher()
@@ -231,6 +379,58 @@ class TestBM25Searcher:
         score = searcher.get_score("test", "unknown_doc")
         
         assert score == 0.0
+    
+    def test_batch_scores_match_single_queries(self):
+        """Test that batched scoring equals scoring each query separately."""
+        searcher = BM25Searcher()
+        
+        documents = [
+            {"id": "doc1", "content": "Apple faces litigation risks and legal issues"},
+            {"id": "doc2", "content": "Microsoft revenue growth and market expansion"},
+            {"id": "doc3", "content": "Legal proceedings and litigation against company"},
+        ]
+        searcher.index_documents(documents)
+        
+        queries = ["litigation legal", "revenue growth", "unknown terms", ""]
+        scores = searcher.batch_scores(queries)
+        
+        assert scores.shape == (4, 3)
+        for query, row in zip(queries, scores):
+            for doc, score in zip(documents, row):
+                assert score == pytest.approx(searcher.get_score(query, doc["id"]))
+    
+    def test_scores_match_okapi_formula(self):
+        """Test sparse scoring against a hand-computed Okapi BM25 score."""
+        searcher = BM25Searcher()
+        
+        documents = [
+            {"id": "doc1", "content": "litigation litigation risk"},
+            {"id": "doc2", "content": "revenue growth"},
+            {"id": "doc3", "content": "dividend payment approved"},
+        ]
+        searcher.index_documents(documents)
+        
+        # "litigation": df=1 of 3 docs, tf=2 in a 3-token doc, avgdl=8/3
+        idf = np.log(3 - 1 + 0.5) - np.log(1 + 0.5)
+        norm = 1.5 * (1 - 0.75 + 0.75 * 3 / (8 / 3))
+        expected = idf * 2 * 2.5 / (2 + norm)
+        
+        assert searcher.get_score("litigation", "doc1") == pytest.approx(expected)
+        assert searcher.search("litigation")[0]["score"] == pytest.approx(expected)
+    
+    def test_get_score_matches_search_scores(self):
+        """Test that single-document scoring agrees with full search."""
+        searcher = BM25Searcher()
+        
+        documents = [
+            {"id": "doc1", "content": "Apple faces litigation risks and legal issues"},
+            {"id": "doc2", "content": "Microsoft revenue growth and market expansion"},
+            {"id": "doc3", "content": "Legal proceedings and litigation against company"},
+        ]
+        searcher.index_documents(documents)
+        
+        for result in searcher.search("litigation legal growth", top_k=3):
+            assert searcher.get_score("litigation legal growth", result["id"]) == pytest.approx(result["score"])
 
 
 class TestHybridRetriever:
@@ -257,26 +457,19 @@ class TestHybridRetriever:
         assert retriever.config.semantic_weight == 0.6
         assert retriever.config.max_results == 20
     
-    def test_initialization_with_injected_dependencies(self):
+    def test_initialization_with_injected_dependencies(self, mock_store, mock_embedder):
         """Test initialization with injected store and embedder."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
         
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
         
         assert retriever._store is mock_store
         assert retriever._embedder is mock_embedder
     
-    def test_retrieve_combines_scores(self):
+    def test_retrieve_combines_scores(self, mock_store, mock_embedder):
         """Test that retrieve combines semantic and keyword scores."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        
-        # Setup mock embedder
-        mock_embedder.embed_query.return_value = np.random.rand(384)
         
         # Setup mock store with search results
-        mock_store.vector_search.return_value = [
+        mock_store.results = [
             SearchResult(
                 id="chunk1",
                 content="litigation risks and legal proceedings",
@@ -304,57 +497,22 @@ class TestHybridRetriever:
         # Verify scores are combined
         assert results[0].semantic_score > 0
         # Verify embedder and store were called
-        mock_embedder.embed_query.assert_called_once()
-        mock_store.vector_search.assert_called_once()
-    
-    def test_retrieve_with_filing_type_filter(self):
-        """Test retrieval with filing type filter."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
-        
-        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve("test query", ticker="AAPL", filing_types=["10-K"])
-        
-        # Verify filing_types was passed to vector_search
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["filing_types"] == ["10-K"]
+        assert len(mock_embedder.queries) == 1
+        assert len(mock_store.calls) == 1
     
-    def test_retrieve_with_section_filter(self):
-        """Test retrieval with section name filter."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
-        
-        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve("test query", ticker="AAPL", section_names=["1A"])
-        
-        # Verify section_names was passed to vector_search
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["section_names"] == ["1A"]
-    
-    def test_retrieve_empty_results(self):
+    def test_retrieve_empty_results(self, mock_store, mock_embedder):
         """Test retrieval with no results."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
         
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
         results = retriever.retrieve("test query", ticker="AAPL")
         
         assert results == []
     
-    def test_retrieve_respects_max_results(self):
+    def test_retrieve_respects_max_results(self, mock_store, mock_embedder):
         """Test that retrieve respects max_results limit."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
         
         # Return more results than max
-        mock_store.vector_search.return_value = [
+        mock_store.results = [
             SearchResult(
                 id=f"chunk{i}",
                 content=f"content {i}",
@@ -372,16 +530,215 @@ class TestHybridRetriever:
         
         assert len(results) <= 5
 
+    
+    def test_retrieve_applies_threshold_and_keeps_tie_order(self, mock_store, mock_embedder):
+        """Test that thresholding drops low scores and ties keep search order."""
+        mock_store.results = [
+            SearchResult(
+                id=f"chunk{i}",
+                content="unrelated content",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=similarity,
+            )
+            for i, similarity in enumerate([0.5, 0.9, 0.5, 0.1])
+        ]
+        
+        config = RetrievalConfig(min_score_threshold=0.2)
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder, config=config)
+        results = retriever.retrieve("litigation", ticker="AAPL")
+        
+        assert [r.chunk_id for r in results] == ["chunk1", "chunk0", "chunk2"]
+        assert results[0].combined_score == pytest.approx(0.7 * 0.9)
+    
+    def test_retrieve_skips_keyword_scoring_when_threshold_unreachable(
+        self, mock_store, mock_embedder
+    ):
+        """Test that BM25 is skipped when no candidate can reach the threshold."""
+        mock_store.results = [
+            SearchResult(
+                id=f"chunk{i}",
+                content="litigation risks",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=similarity,
+            )
+            for i, similarity in enumerate([0.7, 0.5])
+        ]
+        
+        # Best possible score is 0.7 * 0.7 + 0.3 = 0.79
+        config = RetrievalConfig(min_score_threshold=0.85)
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder, config=config)
+        with patch.object(retriever.bm25_searcher, "index_documents") as index_documents:
+            results = retriever.retrieve("litigation", ticker="AAPL")
+        
+        assert results == []
+        index_documents.assert_not_called()
+    
+    @pytest.mark.parametrize("config, similarity, expected", [
+        (RetrievalConfig(min_score_threshold=0.85), [0.7, 0.5], False),
+        (RetrievalConfig(min_score_threshold=0.85), [0.8, 0.5], True),
+        (RetrievalConfig(), [0.0], True),
+        (RetrievalConfig(fusion="rrf", min_score_threshold=0.85), [0.1], True),
+    ])
+    def test_can_reach_threshold(self, mock_embedder, config, similarity, expected):
+        """Test the best-case score bound used for the early exit."""
+        retriever = HybridRetriever(store=FakeStore(), embedder=mock_embedder, config=config)
+        
+        assert retriever._can_reach_threshold(np.array(similarity)) is expected
+    
+    def test_build_pool_extracts_columns(self):
+        """Test that the candidate pool holds parallel id and similarity arrays."""
+        results = [
+            SearchResult(
+                id=f"chunk{i}",
+                content="content",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=similarity,
+            )
+            for i, similarity in enumerate([0.9, 0.4])
+        ]
+        
+        pool = HybridRetriever._build_pool(results)
+        
+        assert list(pool["id"]) == ["chunk0", "chunk1"]
+        assert pool["similarity"].dtype == np.float64
+        assert np.allclose(pool["similarity"], [0.9, 0.4])
+    
+    def test_retrieve_with_rrf_fusion(self, mock_store, mock_embedder):
+        """Test that RRF ranks by reciprocal semantic and keyword ranks."""
+        mock_store.results = [
+            SearchResult(
+                id=chunk_id,
+                content=content,
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=similarity,
+            )
+            for chunk_id, content, similarity in [
+                ("semantic_only", "revenue growth and market expansion", 0.9),
+                ("both", "litigation risks and legal proceedings", 0.8),
+                ("neither", "dividend payment approved by the board", 0.1),
+            ]
+        ]
+        
+        config = RetrievalConfig(fusion="rrf")
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder, config=config)
+        results = retriever.retrieve("litigation", ticker="AAPL")
+        
+        assert [r.chunk_id for r in results] == ["both", "semantic_only", "neither"]
+        assert results[0].combined_score == pytest.approx(1 / 62 + 1 / 61)
+        assert results[1].combined_score == pytest.approx(1 / 61)
+    
+    @pytest.mark.parametrize("query", ["AAPL", '"going concern"', "Item 1A"])
+    def test_literal_query_skips_embedding(self, mock_store, mock_embedder, query):
+        """Test that literal lookups are served by keyword search alone."""
+        mock_store.results = [
+            SearchResult(
+                id=chunk_id,
+                content=content,
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=0.0,
+            )
+            for chunk_id, content in [
+                ("match", "AAPL notes going concern doubts under Item 1A risk factors"),
+                ("other", "dividend payment approved by the board"),
+                ("third", "revenue growth and market expansion"),
+            ]
+        ]
+        
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
+        results = retriever.retrieve(query, ticker="AAPL", section_names=["1A"])
+        
+        assert mock_embedder.queries == []
+        assert mock_store.calls == []
+        assert mock_store.keyword_calls[0]["query"] == query
+        assert mock_store.keyword_calls[0]["section_names"] == ["1A"]
+        assert results[0].chunk_id == "match"
+        assert results[0].semantic_score == 0.0
+        assert results[0].combined_score == results[0].keyword_score == 1.0
+    
+    @pytest.mark.parametrize("code, disabled", [("PGRST202", True), ("500", False)])
+    def test_literal_query_falls_back_on_keyword_error(self, mock_embedder, code, disabled):
+        """Test that a failing full-text RPC falls back to vector search."""
+        
+        class RPCError(Exception):
+            def __init__(self):
+                super().__init__("rpc failed")
+                self.code = code
+        
+        class TextlessStore(FakeStore):
+            def keyword_search(self, **kwargs):
+                raise RPCError()
+        
+        store = TextlessStore()
+        retriever = HybridRetriever(store=store, embedder=mock_embedder)
+        retriever.retrieve("AAPL", ticker="AAPL")
+        
+        assert len(mock_embedder.queries) == 1
+        assert len(store.calls) == 1
+        assert store.supports_keyword_search is not disabled
+    
+    def test_literal_query_without_keyword_support_embeds(self, mock_store, mock_embedder):
+        """Test that stores without full-text search use the vector path."""
+        mock_store.supports_keyword_search = False
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
+        retriever.retrieve("AAPL", ticker="AAPL")
+        
+        assert len(mock_embedder.queries) == 1
+        assert mock_store.keyword_calls == []
+    
+    def test_non_literal_query_embeds(self, mock_store, mock_embedder):
+        """Test that ordinary queries still go through semantic search."""
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
+        retriever.retrieve("litigation risks", ticker="AAPL")
+        
+        assert len(mock_embedder.queries) == 1
+        assert mock_store.keyword_calls == []
+    
+    def test_cache_dimension_must_match_embedder(self, mock_store):
+        """Test that a cache sized for another embedding width is rejected."""
+        with pytest.raises(ValueError, match="must match embedder output_dim"):
+            HybridRetriever(
+                store=mock_store,
+                embedder=LocalEmbedder(truncate_dim=128),
+                cache=LSHCache(dim=384),
+            )
+    
+    def test_retrieve_uses_semantic_cache(self, mock_store, mock_embedder):
+        """Test that repeated queries are served from the semantic cache."""
+        mock_store.results = [
+            SearchResult(
+                id="chunk1",
+                content="litigation risks and legal proceedings",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=0.9,
+            ),
+        ]
+        
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder, cache=LSHCache())
+        first = retriever.retrieve("litigation risks", ticker="AAPL")
+        second = retriever.retrieve("litigation risks", ticker="AAPL")
+        retriever.retrieve("litigation risks", ticker="MSFT")
+        
+        assert [r.chunk_id for r in second] == [r.chunk_id for r in first]
+        assert len(mock_store.calls) == 2
 
 class TestHybridRetrieverSafetyCheck:
     """Tests for safety check retrieval."""
     
-    def test_retrieve_for_safety_check_default_aspects(self):
+    def test_retrieve_for_safety_check_default_aspects(self, mock_store, mock_embedder):
         """Test safety check retrieval uses default aspects."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = [
+        mock_store.results = [
             SearchResult(
                 id="chunk1",
                 content="risk content",
@@ -396,30 +753,23 @@ class TestHybridRetrieverSafetyCheck:
         results = retriever.retrieve_for_safety_check(ticker="AAPL")
         
         # Should have called vector_search multiple times (once per aspect)
-        assert mock_store.vector_search.call_count >= 6  # 6 default aspects
+        assert len(mock_store.calls) >= 6  # 6 default aspects
     
-    def test_retrieve_for_safety_check_custom_aspects(self):
+    def test_retrieve_for_safety_check_custom_aspects(self, mock_store, mock_embedder):
         """Test safety check retrieval with custom aspects."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
         
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
         custom_aspects = ["custom risk 1", "custom risk 2"]
         
         retriever.retrieve_for_safety_check(ticker="AAPL", query_aspects=custom_aspects)
         
-        assert mock_store.vector_search.call_count == 2
+        assert len(mock_store.calls) == 2
     
-    def test_retrieve_for_safety_check_deduplicates(self):
+    def test_retrieve_for_safety_check_deduplicates(self, mock_store, mock_embedder):
         """Test that safety check retrieval deduplicates results."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
         
         # Return same chunk for different queries
-        mock_store.vector_search.return_value = [
+        mock_store.results = [
             SearchResult(
                 id="same_chunk",
                 content="risk content",
@@ -440,68 +790,164 @@ class TestHybridRetrieverSafetyCheck:
         assert len(results) == 1
         assert results[0].chunk_id == "same_chunk"
 
-
-class TestHybridRetrieverConvenienceMethods:
-    """Tests for convenience retrieval methods."""
     
-    def test_retrieve_by_section(self):
-        """Test retrieve_by_section method."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
+    def test_retrieve_for_safety_check_keeps_best_duplicate(self, mock_store, mock_embedder):
+        """Test that a chunk found by several aspects keeps its best score."""
+        def chunk(similarity):
+            return SearchResult(
+                id="same_chunk",
+                content="risk content",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=similarity,
+            )
+        
+        mock_store.queued = [[chunk(0.4)], [chunk(0.9)], [chunk(0.6)]]
         
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve_by_section(
-            query="test",
+        results = retriever.retrieve_for_safety_check(
             ticker="AAPL",
-            section_name="1A",
-            filing_type="10-K",
+            query_aspects=["aspect1", "aspect2", "aspect3"]
         )
         
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["section_names"] == ["1A"]
-        assert call_kwargs["filing_types"] == ["10-K"]
+        assert len(results) == 1
+        assert results[0].semantic_score == 0.9
     
-    def test_retrieve_risk_factors(self):
-        """Test retrieve_risk_factors convenience method."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
+    def test_retrieve_for_safety_check_caches_aspect_embeddings(self, mock_store, mock_embedder):
+        """Test that repeated safety checks embed each aspect only once."""
         
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve_risk_factors(query="litigation", ticker="AAPL")
+        retriever.retrieve_for_safety_check(ticker="AAPL")
+        retriever.retrieve_for_safety_check(ticker="MSFT")
         
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["section_names"] == ["1A"]
-        assert call_kwargs["filing_types"] == ["10-K"]
+        assert len(mock_embedder.queries) == len(HybridRetriever.DEFAULT_SAFETY_ASPECTS)
+        assert len(mock_store.calls) == 2 * len(HybridRetriever.DEFAULT_SAFETY_ASPECTS)
     
-    def test_retrieve_mda_10k(self):
-        """Test retrieve_mda for 10-K filings."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
+    def test_retrieve_for_safety_check_uses_batch_search(self, mock_embedder):
+        """Test that stores with vector_search_batch get a single call."""
+        batch_calls = []
+        
+        class BatchStore(FakeStore):
+            supports_batch_search = True
+            
+            def vector_search_batch(self, **kwargs):
+                batch_calls.append(kwargs)
+                return [
+                    [
+                        SearchResult(
+                            id="chunk1",
+                            content="risk content",
+                            section_name="1A",
+                            filing_type="10-K",
+                            filing_date=date(2024, 1, 15),
+                            similarity=0.8,
+                        ),
+                    ],
+                    [],
+                ]
+        
+        store = BatchStore()
+        retriever = HybridRetriever(store=store, embedder=mock_embedder)
+        results = retriever.retrieve_for_safety_check(
+            ticker="AAPL",
+            query_aspects=["aspect1", "aspect2"]
+        )
         
-        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve_mda(query="revenue", ticker="AAPL", filing_type="10-K")
+        assert len(batch_calls) == 1
+        assert batch_calls[0]["query_embeddings"].shape == (2, 384)
+        assert store.calls == []
+        assert [r.chunk_id for r in results] == ["chunk1"]
+    
+    @pytest.mark.parametrize("code, disabled", [("PGRST202", True), ("500", False)])
+    def test_retrieve_for_safety_check_falls_back_on_batch_error(
+        self, mock_embedder, code, disabled
+    ):
+        """Test that a failing batch RPC falls back to per-aspect searches."""
+        
+        class RPCError(Exception):
+            def __init__(self):
+                super().__init__("rpc failed")
+                self.code = code
+        
+        class BatchStore(FakeStore):
+            supports_batch_search = True
+            
+            def vector_search_batch(self, **kwargs):
+                raise RPCError()
+        
+        store = BatchStore(results=[
+            SearchResult(
+                id="chunk1",
+                content="risk content",
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=0.8,
+            ),
+        ])
+        retriever = HybridRetriever(store=store, embedder=mock_embedder)
+        results = retriever.retrieve_for_safety_check(
+            ticker="AAPL",
+            query_aspects=["aspect1", "aspect2"]
+        )
         
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["section_names"] == ["7"]  # Item 7 in 10-K
+        assert len(store.calls) == 2
+        assert [r.chunk_id for r in results] == ["chunk1"]
+        assert store.supports_batch_search is not disabled
     
-    def test_retrieve_mda_10q(self):
-        """Test retrieve_mda for 10-Q filings."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.random.rand(384)
-        mock_store.vector_search.return_value = []
+    def test_retrieve_for_safety_check_scores_keywords_per_aspect(self, mock_store, mock_embedder):
+        """Test that each aspect's keyword scores come from its own query."""
         
+        def chunk(chunk_id, content):
+            return SearchResult(
+                id=chunk_id,
+                content=content,
+                section_name="1A",
+                filing_type="10-K",
+                filing_date=date(2024, 1, 15),
+                similarity=0.5,
+            )
+        
+        other = chunk("other", "dividend payment approved by the board")
+        mock_store.queued = [
+            [chunk("legal", "litigation and legal proceedings"), other],
+            [chunk("debt", "debt obligations and borrowings"), other],
+        ]
+        
+        retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
+        results = retriever.retrieve_for_safety_check(
+            ticker="AAPL",
+            query_aspects=["litigation", "debt"]
+        )
+        
+        keyword_scores = {r.chunk_id: r.keyword_score for r in results}
+        assert keyword_scores == {"legal": 1.0, "debt": 1.0, "other": 0.0}
+
+
+class TestHybridRetrieverFilterRouting:
+    """Tests that filters and convenience methods reach vector_search."""
+    
+    @pytest.mark.parametrize("method,kwargs,expected", [
+        ("retrieve", {"filing_types": ["10-K"]}, {"filing_types": ["10-K"]}),
+        ("retrieve", {"section_names": ["1A"]}, {"section_names": ["1A"]}),
+        (
+            "retrieve_by_section",
+            {"section_name": "1A", "filing_type": "10-K"},
+            {"section_names": ["1A"], "filing_types": ["10-K"]},
+        ),
+        ("retrieve_risk_factors", {}, {"section_names": ["1A"], "filing_types": ["10-K"]}),
+        ("retrieve_mda", {"filing_type": "10-K"}, {"section_names": ["7"]}),  # Item 7 in 10-K
+        ("retrieve_mda", {"filing_type": "10-Q"}, {"section_names": ["2"]}),  # Item 2 in 10-Q
+    ])
+    def test_filter_routing(self, mock_store, mock_embedder, method, kwargs, expected):
+        """Test that each method passes its filters to vector_search."""
         retriever = HybridRetriever(store=mock_store, embedder=mock_embedder)
-        retriever.retrieve_mda(query="revenue", ticker="AAPL", filing_type="10-Q")
+        getattr(retriever, method)(query="test query", ticker="AAPL", **kwargs)
         
-        call_kwargs = mock_store.vector_search.call_args[1]
-        assert call_kwargs["section_names"] == ["2"]  # Item 2 in 10-Q
+        call_kwargs = mock_store.calls[-1]
+        for key, value in expected.items():
+            assert call_kwargs[key] == value
 
 
 class TestRetrievalResult:
@@ -542,20 +988,30 @@ class TestRetrievalResult:
         assert result.combined_score == 0.0
         assert result.metadata == {}
 
+    
+    def test_retrieval_result_is_slotted_and_frozen(self):
+        """Test that retrieval results carry no instance dict and are immutable."""
+        result = RetrievalResult(
+            chunk_id="chunk1",
+            content="test",
+            section_name="1A",
+            filing_type="10-K",
+            filing_date=date(2024, 1, 15),
+            ticker="AAPL",
+        )
+        
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.combined_score = 1.0
 
 class TestIntegration:
     """Integration-style tests for the hybrid retrieval system."""
     
-    def test_full_retrieval_pipeline(self):
+    def test_full_retrieval_pipeline(self, mock_store, mock_embedder):
         """Test the full retrieval pipeline with mocked dependencies."""
-        mock_store = MagicMock()
-        mock_embedder = MagicMock()
-        
-        # Setup embedder
-        mock_embedder.embed_query.return_value = np.random.rand(384)
         
         # Setup store with realistic results
-        mock_store.vector_search.return_value = [
+        mock_store.results = [
             SearchResult(
                 id="chunk1",
                 content="The company faces significant litigation risks including ongoing lawsuits related to patent infringement.",
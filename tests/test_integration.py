@@ -9,20 +9,26 @@ Tests cover:
 - Edge cases (missing data, API failures)
 """
 
+import os
+
 import pytest
+import pytest_asyncio
 import httpx
-from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 from src.api.main import app
-from src.safety.checker import SafetyChecker, SafetyDecision
-from src.data.store import SupabaseStore, EarningsEntry
-from src.safety.earnings import EarningsChecker
+from src.api.models import SafetyCheckRequest
+from src.safety.checker import SafetyChecker, SafetyCheckResult, SafetyDecision
+from src.data.store import SupabaseStore, EarningsEntry, SafetyLog
+from src.safety.earnings import EarningsChecker, EarningsProximity
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module")
 async def client():
-    """Create async test client."""
+    """Create async test client shared by every test in the module."""
     async with httpx.AsyncClient(
         transport=httpx.ASGITransport(app=app),
         base_url="http://test"
@@ -30,11 +36,60 @@ async def client():
         yield c
 
 
+@pytest.fixture(scope="session")
+def sync_client():
+    """
+    Create sync test client for tests that need no concurrency.
+    
+    Not entered as a context manager, so the startup event (database and
+    embedding model setup) does not run, matching the async client.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def supabase_store():
+    """Create one real Supabase store shared by the database tests."""
+    return SupabaseStore()
+
+
+@pytest.fixture(scope="class")
+def _class_patched_checker():
+    """Patch the API's safety checker once for a whole test class."""
+    with patch('src.api.main.safety_checker') as mock_checker:
+        yield mock_checker
+
+
+@pytest.fixture
+def patched_checker(_class_patched_checker):
+    """Class-wide safety checker patch, reset for each test."""
+    _class_patched_checker.reset_mock(return_value=True, side_effect=True)
+    return _class_patched_checker
+
+
+# Baseline fields for mocked safety check results; tests override what matters
+_DEFAULT_RESULT = dict(
+    decision=SafetyDecision.PROCEED,
+    ticker="AAPL",
+    risk_score=3.0,
+    reasoning="",
+    cache_hit=False,
+)
+
+
+def _result(**overrides) -> SafetyCheckResult:
+    """Build a SafetyCheckResult from the defaults plus overrides."""
+    return SafetyCheckResult(**{**_DEFAULT_RESULT, **overrides})
+
+
+# SupabaseStore attribute names, computed once instead of per mock instance
+STORE_SPEC = dir(SupabaseStore)
+
+
 @pytest.fixture
 def mock_store():
-    """Create mock store for integration tests."""
-    store = MagicMock(spec=SupabaseStore)
-    return store
+    """Create mock store restricted to SupabaseStore's attributes."""
+    return MagicMock(spec=STORE_SPEC)
 
 
 @pytest.fixture
@@ -44,185 +99,171 @@ def mock_retriever():
     return retriever
 
 
+@pytest.fixture(scope="module")
+def shared_safety_checker():
+    """Build one SafetyChecker with mocked dependencies for the module."""
+    return SafetyChecker(
+        store=MagicMock(),
+        retriever=MagicMock(),
+        earnings_checker=MagicMock()
+    )
+
+
+@pytest.fixture
+def safety_checker_mocked(shared_safety_checker):
+    """Shared SafetyChecker with its mocked dependencies reset for each test."""
+    for dependency in (
+        shared_safety_checker._store,
+        shared_safety_checker._retriever,
+        shared_safety_checker._earnings_checker,
+    ):
+        dependency.reset_mock(return_value=True, side_effect=True)
+    return shared_safety_checker
+
+
 class TestEndToEndSafetyCheck:
     """Integration tests for complete safety check workflow."""
     
-    @pytest.mark.asyncio
-    async def test_complete_safety_check_flow_proceed(self, client):
-        """Test complete flow resulting in PROCEED decision."""
-        with patch('src.api.main.safety_checker') as mock_checker:
-            from src.safety.checker import SafetyCheckResult
-            
-            # Mock a low-risk scenario
-            mock_checker.check_safety.return_value = SafetyCheckResult(
-                decision=SafetyDecision.PROCEED,
-                ticker="AAPL",
+    @pytest.mark.parametrize("mock_result,request_json,expected", [
+        pytest.param(
+            # Low-risk scenario
+            _result(
                 risk_score=3.5,
                 reasoning="Low risk score (3.5). No critical events detected.",
-                cache_hit=False,
-            )
-            
-            response = await client.post(
-                "/safety-check",
-                json={
-                    "ticker": "AAPL",
-                    "allocation_pct": 10.0,
-                    "use_cache": True
-                }
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["decision"] == "PROCEED"
-            assert data["ticker"] == "AAPL"
-            assert data["risk_score"] == 3.5
-            assert "Low risk" in data["reasoning"]
-            
-            # Verify safety checker was called with correct params
-            mock_checker.check_safety.assert_called_once()
-            call_args = mock_checker.check_safety.call_args
-            assert call_args[1]["ticker"] == "AAPL"
-            assert call_args[1]["allocation_pct"] == 10.0
-    
-    @pytest.mark.asyncio
-    async def test_complete_safety_check_flow_reduce(self, client):
-        """Test complete flow resulting in REDUCE decision."""
-        with patch('src.api.main.safety_checker') as mock_checker:
-            from src.safety.checker import SafetyCheckResult
-            
-            # Mock elevated risk with earnings warning
-            mock_checker.check_safety.return_value = SafetyCheckResult(
+            ),
+            {"ticker": "AAPL", "allocation_pct": 10.0, "use_cache": True},
+            {
+                "decision": "PROCEED",
+                "ticker": "AAPL",
+                "risk_score": 3.5,
+                "reasoning": "Low risk score (3.5). No critical events detected.",
+            },
+            id="proceed",
+        ),
+        pytest.param(
+            # Elevated risk with earnings warning
+            _result(
                 decision=SafetyDecision.REDUCE,
                 ticker="MSFT",
                 risk_score=6.8,
                 reasoning="Elevated risk score (6.8). Earnings approaching.",
                 earnings_warning="Earnings in 2 days",
                 allocation_warning="High allocation: 18.0%",
-                cache_hit=False,
-            )
-            
-            response = await client.post(
-                "/safety-check",
-                json={
-                    "ticker": "MSFT",
-                    "allocation_pct": 18.0,
-                    "use_cache": False
-                }
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["decision"] == "REDUCE"
-            assert data["risk_score"] == 6.8
-            assert data["earnings_warning"] == "Earnings in 2 days"
-            assert data["allocation_warning"] == "High allocation: 18.0%"
-    
-    @pytest.mark.asyncio
-    async def test_complete_safety_check_flow_veto(self, client):
-        """Test complete flow resulting in VETO decision."""
-        with patch('src.api.main.safety_checker') as mock_checker:
-            from src.safety.checker import SafetyCheckResult
-            
-            # Mock critical risk scenario
-            mock_checker.check_safety.return_value = SafetyCheckResult(
+            ),
+            {"ticker": "MSFT", "allocation_pct": 18.0, "use_cache": False},
+            {
+                "decision": "REDUCE",
+                "risk_score": 6.8,
+                "earnings_warning": "Earnings in 2 days",
+                "allocation_warning": "High allocation: 18.0%",
+            },
+            id="reduce",
+        ),
+        pytest.param(
+            # Critical risk scenario
+            _result(
                 decision=SafetyDecision.VETO,
                 ticker="XYZ",
                 risk_score=9.5,
                 reasoning="Critical risk detected (9.5). Bankruptcy filing mentioned.",
                 critical_events=["Bankruptcy filing detected", "Going concern warning"],
-                cache_hit=False,
-            )
-            
-            response = await client.post(
-                "/safety-check",
-                json={
-                    "ticker": "XYZ",
-                    "allocation_pct": 5.0,
-                    "use_cache": True
-                }
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["decision"] == "VETO"
-            assert data["risk_score"] == 9.5
-            assert len(data["critical_events"]) == 2
-            assert "Bankruptcy" in data["critical_events"][0]
+            ),
+            {"ticker": "XYZ", "allocation_pct": 5.0, "use_cache": True},
+            {
+                "decision": "VETO",
+                "risk_score": 9.5,
+                "critical_events": ["Bankruptcy filing detected", "Going concern warning"],
+            },
+            id="veto",
+        ),
+    ])
+    @pytest.mark.asyncio
+    async def test_complete_safety_check_flow(
+        self, client, patched_checker, mock_result, request_json, expected
+    ):
+        """Test complete flow for each safety decision."""
+        patched_checker.check_safety.return_value = mock_result
+        
+        response = await client.post("/safety-check", json=request_json)
+        
+        assert response.status_code == 200
+        data = response.json()
+        for key, value in expected.items():
+            assert data[key] == value
+        
+        # Verify safety checker was called with correct params
+        patched_checker.check_safety.assert_called_once()
+        call_args = patched_checker.check_safety.call_args
+        assert call_args[1]["ticker"] == request_json["ticker"]
+        assert call_args[1]["allocation_pct"] == request_json["allocation_pct"]
 
 
+@pytest.mark.skipif(
+    not (os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_KEY")),
+    reason="Supabase not configured"
+)
 class TestDatabaseIntegration:
     """Integration tests for database operations."""
     
-    def test_earnings_data_retrieval(self):
+    def test_earnings_data_retrieval(self, supabase_store):
         """Test retrieving earnings data from database."""
-        try:
-            store = SupabaseStore()
-            earnings_checker = EarningsChecker(store=store)
-            
-            # Test getting next earnings for a ticker
-            proximity = earnings_checker.check_proximity("AAPL")
-            
-            # Should return a valid proximity result
-            assert proximity is not None
-            assert isinstance(proximity.days_until, (int, type(None)))
-            
-        except Exception as e:
-            # If database not available, test should pass gracefully
-            pytest.skip(f"Database not available: {e}")
+        earnings_checker = EarningsChecker(store=supabase_store)
+        
+        # Test getting next earnings for a ticker
+        proximity = earnings_checker.check_earnings_proximity("AAPL")
+        
+        # Should return a valid proximity result
+        assert proximity is not None
+        assert isinstance(proximity.days_until_earnings, (int, type(None)))
     
-    def test_safety_log_storage(self):
+    def test_safety_log_storage(self, supabase_store):
         """Test storing safety check logs in database."""
-        try:
-            store = SupabaseStore()
-            
-            # Create a test safety log entry
-            from src.data.store import SafetyLog
-            
-            log = SafetyLog(
-                ticker="TEST",
-                decision="PROCEED",
-                risk_score=3.0,
-                reasoning="Test log entry",
-                proposed_allocation=10.0,
-                current_allocation=5.0,
-                timestamp=datetime.utcnow(),
-            )
-            
-            # This tests the log structure is valid
-            assert log.ticker == "TEST"
-            assert log.decision == "PROCEED"
-            assert log.risk_score == 3.0
-            
-        except Exception as e:
-            pytest.skip(f"Database not available: {e}")
+        # Create a test safety log entry
+        log = SafetyLog(
+            ticker="TEST",
+            decision="PROCEED",
+            risk_score=3.0,
+            reasoning="Test log entry",
+            proposed_allocation=10.0,
+            current_allocation=5.0,
+            timestamp=datetime(2024, 6, 15, 12, 0),
+        )
+        
+        # This tests the log structure is valid
+        assert log.ticker == "TEST"
+        assert log.decision == "PROCEED"
+        assert log.risk_score == 3.0
 
 
 class TestCacheBehavior:
     """Integration tests for cache behavior."""
     
-    def test_cache_key_generation_consistency(self):
-        """Test that cache keys are generated consistently."""
-        from src.safety.checker import SafetyChecker
-        
-        mock_store = MagicMock()
-        checker = SafetyChecker(store=mock_store)
+    @pytest.mark.parametrize("alloc_a,alloc_b,equal", [
+        (10.0, 10.0, True),   # Same inputs
+        (10.5, 12.0, True),   # Both in 10-15% bucket (5% buckets)
+        (10.0, 16.0, False),  # Different buckets
+    ])
+    def test_cache_key_allocation_buckets(self, safety_checker_mocked, alloc_a, alloc_b, equal):
+        """Test that cache keys match exactly when allocations share a bucket."""
+        checker = safety_checker_mocked
         
-        # Same inputs should generate same cache key
-        key1 = checker._generate_cache_key("AAPL", 10.0)
-        key2 = checker._generate_cache_key("AAPL", 10.0)
-        assert key1 == key2
+        key_a = checker._generate_cache_key("AAPL", alloc_a)
+        key_b = checker._generate_cache_key("AAPL", alloc_b)
         
-        # Different tickers should generate different keys
-        key3 = checker._generate_cache_key("MSFT", 10.0)
-        assert key1 != key3
+        assert (key_a == key_b) is equal
+    
+    @pytest.mark.parametrize("ticker_a,ticker_b,equal", [
+        ("AAPL", "AAPL", True),
+        ("AAPL", "MSFT", False),
+    ])
+    def test_cache_key_tickers(self, safety_checker_mocked, ticker_a, ticker_b, equal):
+        """Test that cache keys match exactly when tickers match."""
+        checker = safety_checker_mocked
         
-        # Allocation bucketing (5% buckets)
-        key4 = checker._generate_cache_key("AAPL", 10.5)
-        key5 = checker._generate_cache_key("AAPL", 12.0)
-        assert key4 == key5  # Both in 10-15% bucket
+        key_a = checker._generate_cache_key(ticker_a, 10.0)
+        key_b = checker._generate_cache_key(ticker_b, 10.0)
         
-        key6 = checker._generate_cache_key("AAPL", 16.0)
-        assert key4 != key6  # Different buckets
+        assert (key_a == key_b) is equal
     
     @pytest.mark.asyncio
     async def test_cache_stats_endpoint(self, client):
@@ -260,58 +301,20 @@ class TestCacheBehavior:
 class TestErrorHandling:
     """Integration tests for error handling and graceful degradation."""
     
-    @pytest.mark.asyncio
-    async def test_invalid_ticker_validation(self, client):
-        """Test validation error for invalid ticker."""
-        response = await client.post(
-            "/safety-check",
-            json={
-                "ticker": "",  # Empty ticker
-                "allocation_pct": 10.0
-            }
-        )
-        
-        assert response.status_code == 422
+    @pytest.mark.parametrize("payload", [
+        pytest.param({"ticker": "", "allocation_pct": 10.0}, id="empty-ticker"),
+        pytest.param({"ticker": "AAPL", "allocation_pct": 150.0}, id="allocation-above-100"),
+        pytest.param({"ticker": "AAPL", "allocation_pct": -5.0}, id="allocation-below-0"),
+        pytest.param({"allocation_pct": 10.0}, id="missing-ticker"),
+    ])
+    def test_safety_check_request_validation(self, payload):
+        """Test that invalid safety check requests are rejected by the schema."""
+        # The endpoint's 422 responses are covered in test_api.py
+        with pytest.raises(ValidationError):
+            SafetyCheckRequest(**payload)
     
-    @pytest.mark.asyncio
-    async def test_allocation_out_of_range(self, client):
-        """Test validation for allocation percentage."""
-        # Test upper bound
-        response = await client.post(
-            "/safety-check",
-            json={
-                "ticker": "AAPL",
-                "allocation_pct": 150.0
-            }
-        )
-        assert response.status_code == 422
-        
-        # Test lower bound
-        response = await client.post(
-            "/safety-check",
-            json={
-                "ticker": "AAPL",
-                "allocation_pct": -5.0
-            }
-        )
-        assert response.status_code == 422
-    
-    @pytest.mark.asyncio
-    async def test_missing_required_fields(self, client):
-        """Test error handling for missing required fields."""
-        response = await client.post(
-            "/safety-check",
-            json={
-                "allocation_pct": 10.0
-                # Missing ticker
-            }
-        )
-        
-        assert response.status_code == 422
-    
-    def test_graceful_degradation_no_earnings_data(self):
+    def test_graceful_degradation_no_earnings_data(self, mock_store):
         """Test system handles missing earnings data gracefully."""
-        mock_store = MagicMock()
         mock_store.get_next_earnings.return_value = None
         
         earnings_checker = EarningsChecker(store=mock_store)
@@ -322,32 +325,22 @@ class TestErrorHandling:
         assert proximity.days_until_earnings is None
         assert proximity.has_upcoming_earnings is False
     
-    def test_graceful_degradation_retrieval_failure(self):
+    def test_graceful_degradation_retrieval_failure(self, safety_checker_mocked):
         """Test system handles retrieval failures gracefully."""
-        from src.safety.checker import SafetyChecker
-        
-        mock_store = MagicMock()
-        mock_retriever = MagicMock()
-        mock_earnings_checker = MagicMock()
+        checker = safety_checker_mocked
+        mock_retriever = checker._retriever
+        mock_earnings_checker = checker._earnings_checker
         
         # Simulate retrieval failure
         mock_retriever.retrieve_for_safety_check.side_effect = Exception("Retrieval failed")
         
         # Mock earnings checker to return no upcoming earnings
-        from src.safety.earnings import EarningsProximity
         mock_earnings_checker.check_earnings_proximity.return_value = EarningsProximity(
             ticker="AAPL",
             has_upcoming_earnings=False,
             threshold_days=3
         )
         
-        # Pass mock_retriever through constructor
-        checker = SafetyChecker(
-            store=mock_store,
-            retriever=mock_retriever,
-            earnings_checker=mock_earnings_checker
-        )
-        
         # Should handle error and return a safe decision
         # VETO is returned because critical_events contains the error message
         result = checker.check_safety(
@@ -367,56 +360,38 @@ class TestEdgeCases:
     """Integration tests for edge cases."""
     
     @pytest.mark.asyncio
-    async def test_ticker_case_insensitivity(self, client):
+    async def test_ticker_case_insensitivity(self, client, patched_checker):
         """Test that ticker symbols are case-insensitive."""
-        with patch('src.api.main.safety_checker') as mock_checker:
-            from src.safety.checker import SafetyCheckResult
-            
-            mock_checker.check_safety.return_value = SafetyCheckResult(
-                decision=SafetyDecision.PROCEED,
-                ticker="AAPL",
-                risk_score=3.0,
-                reasoning="Test",
-                cache_hit=False,
-            )
-            
-            # Send lowercase ticker
-            response = await client.post(
-                "/safety-check",
-                json={
-                    "ticker": "aapl",
-                    "allocation_pct": 10.0
-                }
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            # Should be converted to uppercase
-            assert data["ticker"] == "AAPL"
+        patched_checker.check_safety.return_value = _result(reasoning="Test")
+        
+        # Send lowercase ticker
+        response = await client.post(
+            "/safety-check",
+            json={
+                "ticker": "aapl",
+                "allocation_pct": 10.0
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        # Should be converted to uppercase
+        assert data["ticker"] == "AAPL"
     
     @pytest.mark.asyncio
-    async def test_zero_allocation(self, client):
+    async def test_zero_allocation(self, client, patched_checker):
         """Test handling of zero allocation."""
-        with patch('src.api.main.safety_checker') as mock_checker:
-            from src.safety.checker import SafetyCheckResult
-            
-            mock_checker.check_safety.return_value = SafetyCheckResult(
-                decision=SafetyDecision.PROCEED,
-                ticker="AAPL",
-                risk_score=3.0,
-                reasoning="Zero allocation",
-                cache_hit=False,
-            )
-            
-            response = await client.post(
-                "/safety-check",
-                json={
-                    "ticker": "AAPL",
-                    "allocation_pct": 0.0
-                }
-            )
-            
-            assert response.status_code == 200
+        patched_checker.check_safety.return_value = _result(reasoning="Zero allocation")
+        
+        response = await client.post(
+            "/safety-check",
+            json={
+                "ticker": "AAPL",
+                "allocation_pct": 0.0
+            }
+        )
+        
+        assert response.status_code == 200
     
     @pytest.mark.asyncio
     async def test_filing_indexing_with_invalid_data(self, client):
@@ -436,13 +411,10 @@ class TestEdgeCases:
         
         assert response.status_code == 422
     
-    def test_earnings_on_exact_boundary(self):
+    def test_earnings_on_exact_boundary(self, mock_store, frozen_today):
         """Test earnings proximity on exact warning boundary."""
-        mock_store = MagicMock()
-        
         # Set earnings exactly 3 days away (warning threshold)
-        today = date.today()
-        earnings_date = today + timedelta(days=3)
+        earnings_date = frozen_today + timedelta(days=3)
         
         mock_store.get_next_earnings.return_value = EarningsEntry(
             ticker="AAPL",
@@ -463,10 +435,9 @@ class TestEdgeCases:
 class TestHealthAndMonitoring:
     """Integration tests for health checks and monitoring."""
     
-    @pytest.mark.asyncio
-    async def test_health_endpoint_structure(self, client):
+    def test_health_endpoint_structure(self, sync_client):
         """Test health endpoint returns complete structure."""
-        response = await client.get("/health")
+        response = sync_client.get("/health")
         
         assert response.status_code == 200
         data = response.json()
@@ -483,10 +454,9 @@ class TestHealthAndMonitoring:
         assert "embedder" in deps
         assert "retriever" in deps
     
-    @pytest.mark.asyncio
-    async def test_root_endpoint_metadata(self, client):
+    def test_root_endpoint_metadata(self, sync_client):
         """Test root endpoint returns API metadata."""
-        response = await client.get("/")
+        response = sync_client.get("/")
         
         assert response.status_code == 200
         data = response.json()
@@ -5,7 +5,12 @@ These tests require a valid GROQ_API_KEY environment variable.
 Run with: pytest tests/test_llm_integration.py -v -s
 """
 
+import asyncio
+import json
 import os
+import re
+
+import groq
 import pytest
 from unittest.mock import patch
 
@@ -15,35 +20,65 @@ def has_groq_api_key():
     return bool(os.getenv("GROQ_API_KEY"))
 
 
+@pytest.fixture(scope="class")
+def llm_client():
+    """Create one real LLM client shared by a test class."""
+    from src.llm.client import LLMClient
+    
+    return LLMClient()
+
+
 @pytest.mark.skipif(not has_groq_api_key(), reason="GROQ_API_KEY not set")
 class TestLLMIntegration:
     """Integration tests that make actual API calls to Groq."""
     
-    def test_llm_client_real_initialization(self):
+    def test_llm_client_real_initialization(self, llm_client):
         """Test LLM client initializes with real Groq API."""
-        from src.llm.client import LLMClient
-        
-        client = LLMClient()
+        client = llm_client
         
         assert client.provider == "groq"
         assert client.client is not None
         assert hasattr(client.client, 'chat')
     
-    def test_llm_chat_completion_real(self):
-        """Test actual chat completion with Groq API."""
-        from src.llm.client import LLMClient
-        
-        client = LLMClient()
+    async def test_llm_parallel_completions(self, llm_client):
+        """Test chat, JSON mode and risk analysis completions issued concurrently."""
+        client = llm_client
         
-        messages = [
+        chat_messages = [
             {"role": "system", "content": "You are a helpful assistant. Respond briefly."},
             {"role": "user", "content": "What is 2 + 2? Answer with just the number."}
         ]
+        json_messages = [
+            {"role": "system", "content": "You are a helpful assistant that responds in JSON format."},
+            {"role": "user", "content": "Return a JSON object with keys 'status' set to 'ok' and 'value' set to 42."}
+        ]
+        risk_messages = [
+            {
+                "role": "system", 
+                "content": """You are a financial risk analyst. Analyze the following SEC filing excerpt 
+                and provide a risk score from 1-10 where 10 is highest risk. 
+                Respond with just the number."""
+            },
+            {
+                "role": "user", 
+                "content": """The company faces significant litigation risks related to ongoing 
+                patent disputes. Additionally, there are material weaknesses in internal controls 
+                that could affect financial reporting accuracy."""
+            }
+        ]
         
-        response = client.chat_completion(
-            messages=messages,
-            temperature=0.0,
-            max_tokens=10
+        # LLMClient is synchronous; run the three round trips in worker threads
+        response, json_response, risk_response = await asyncio.gather(
+            asyncio.to_thread(
+                client.chat_completion, messages=chat_messages, temperature=0.0, max_tokens=10
+            ),
+            asyncio.to_thread(
+                client.chat_completion, messages=json_messages, temperature=0.0, max_tokens=50,
+                json_mode=True
+            ),
+            asyncio.to_thread(
+                client.chat_completion, messages=risk_messages, temperature=0.0, max_tokens=10
+            ),
         )
         
         # Verify response structure
@@ -62,65 +97,15 @@ class TestLLMIntegration:
         print(f"\nLLM Response: {response['content']}")
         print(f"Model: {response['model']}")
         print(f"Tokens used: {response['usage']['total_tokens']}")
-    
-    def test_llm_json_mode(self):
-        """Test JSON mode response from Groq API."""
-        from src.llm.client import LLMClient
-        import json
-        
-        client = LLMClient()
-        
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant that responds in JSON format."},
-            {"role": "user", "content": "Return a JSON object with keys 'status' set to 'ok' and 'value' set to 42."}
-        ]
-        
-        response = client.chat_completion(
-            messages=messages,
-            temperature=0.0,
-            max_tokens=50,
-            json_mode=True
-        )
         
-        # Verify response is valid JSON
-        content = response["content"]
-        parsed = json.loads(content)
+        # Verify JSON mode response is valid JSON
+        parsed = json.loads(json_response["content"])
         
         assert "status" in parsed or "value" in parsed
         print(f"\nJSON Response: {parsed}")
-    
-    def test_llm_risk_analysis_prompt(self):
-        """Test a realistic risk analysis prompt."""
-        from src.llm.client import LLMClient
-        
-        client = LLMClient()
-        
-        messages = [
-            {
-                "role": "system", 
-                "content": """You are a financial risk analyst. Analyze the following SEC filing excerpt 
-                and provide a risk score from 1-10 where 10 is highest risk. 
-                Respond with just the number."""
-            },
-            {
-                "role": "user", 
-                "content": """The company faces significant litigation risks related to ongoing 
-                patent disputes. Additionally, there are material weaknesses in internal controls 
-                that could affect financial reporting accuracy."""
-            }
-        ]
         
-        response = client.chat_completion(
-            messages=messages,
-            temperature=0.0,
-            max_tokens=10
-        )
-        
-        content = response["content"].strip()
-        
-        # Should return a number between 1-10
-        # Extract first number found
-        import re
+        # Risk analysis should return a number between 1-10
+        content = risk_response["content"].strip()
         numbers = re.findall(r'\d+', content)
         assert len(numbers) > 0, f"Expected a number in response: {content}"
         
@@ -130,11 +115,9 @@ class TestLLMIntegration:
         print(f"\nRisk Analysis Response: {content}")
         print(f"Extracted Risk Score: {risk_score}")
     
-    def test_llm_get_info_real(self):
+    def test_llm_get_info_real(self, llm_client):
         """Test get_info with real client."""
-        from src.llm.client import LLMClient
-        
-        client = LLMClient()
+        client = llm_client
         info = client.get_info()
         
         assert info["provider"] == "groq"
@@ -148,13 +131,12 @@ class TestLLMIntegration:
 class TestLLMErrorHandling:
     """Test error handling with real API."""
     
-    def test_llm_handles_empty_messages(self):
+    def test_llm_handles_empty_messages(self, llm_client):
         """Test handling of empty messages list."""
-        from src.llm.client import LLMClient
-        
-        client = LLMClient()
+        client = llm_client
         
-        with pytest.raises(Exception):
+        # Groq rejects an empty messages list as a bad request (HTTP 400)
+        with pytest.raises(groq.BadRequestError):
             client.chat_completion(messages=[], max_tokens=10)
     
     def test_llm_handles_invalid_model(self):
@@ -166,13 +148,12 @@ class TestLLMErrorHandling:
         try:
             os.environ["LLM_MODEL"] = "invalid-model-name"
             
-            from importlib import reload
-            import src.llm.client as llm_module
-            reload(llm_module)
-            
-            client = llm_module.LLMClient()
+            # LLMClient reads the environment at construction time
+            from src.llm.client import LLMClient
+            client = LLMClient()
             
-            with pytest.raises(Exception):
+            # Unknown models come back as a 4xx API status error naming the model
+            with pytest.raises(groq.APIStatusError, match="invalid-model-name"):
                 client.chat_completion(
                     messages=[{"role": "user", "content": "test"}],
                     max_tokens=10
@@ -4,8 +4,11 @@ Unit tests for SEC Filing Parser.
 Tests HTML cleaning, section extraction, and parsing for 10-K, 10-Q, and 8-K filings.
 """
 
+import re
+
 import pytest
-from src.data.parser import SECFilingParser, ParsedSection
+from unittest.mock import patch
+from src.data.parser import SECFilingParser, ParsedSection, _section_header_regexes
 
 
 class TestHTMLCleaning:
@@ -66,6 +69,38 @@ class TestHTMLCleaning:
         assert "stylesheet" not in result
         assert "Content here" in result
     
+    def test_clean_html_removes_noscript_and_comments(self):
+        """Test that noscript contents and HTML comments are removed."""
+        html = """
+        <html><body>
+            <noscript>Enable JavaScript</noscript>
+            <!-- internal note -->
+            <p>Visible text</p>
+        </body></html>
+        """
+        result = self.parser.clean_html(html)
+        
+        assert "Enable JavaScript" not in result
+        assert "internal note" not in result
+        assert "Visible text" in result
+    
+    def test_clean_html_removes_nested_skip_tags(self):
+        """Test that skipped tags nested inside each other are removed once."""
+        html = """
+        <html><head>
+            <noscript><link rel="stylesheet" href="a.css"><style>p { margin: 0; }</style></noscript>
+        </head><body>
+            <noscript><p>Fallback <script>track();</script> text</p></noscript>
+            <p>Body text</p>
+        </body></html>
+        """
+        result = self.parser.clean_html(html)
+        
+        assert "margin" not in result
+        assert "Fallback" not in result
+        assert "track()" not in result
+        assert "Body text" in result
+    
     def test_clean_html_normalizes_whitespace(self):
         """Test that excessive whitespace is normalized."""
         html = """
@@ -418,6 +453,67 @@ class TestConvenienceMethods:
         result = self.parser.get_mda(html, "10-K")
         
         assert result is None
+    
+    def test_risk_factors_and_mda_parse_filing_once(self):
+        """Test that chained convenience calls reuse the cached parse."""
+        html = """
+        <html><body>
+            <h2>ITEM 1A. RISK FACTORS</h2>
+            <p>Supply chain disruption risk.</p>
+            <h2>ITEM 7. MANAGEMENT'S DISCUSSION AND ANALYSIS</h2>
+            <p>Margins expanded this year.</p>
+        </body></html>
+        """
+        with patch.object(
+            self.parser, "_fast_extract_sections", wraps=self.parser._fast_extract_sections
+        ) as fast:
+            risk = self.parser.get_risk_factors(html)
+            mda = self.parser.get_mda(html)
+        
+        assert "Supply chain" in risk
+        assert "Margins expanded" in mda
+        fast.assert_called_once()
+    
+    def test_cached_sections_are_copies(self):
+        """Test that mutating returned sections does not affect the cache."""
+        html = "<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Original risk text.</p>"
+        
+        self.parser.parse_10k(html)["1A"].content = "mutated"
+        
+        assert "Original risk text" in self.parser.get_risk_factors(html)
+    
+    def test_cache_evicts_oldest_filing(self):
+        """Test that the cache keeps at most cache_size filings."""
+        parser = SECFilingParser(cache_size=1)
+        first = "<h2>ITEM 1A. RISK FACTORS</h2>\n<p>First filing.</p>"
+        second = "<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Second filing.</p>"
+        
+        parser.parse_10k(first)
+        parser.parse_10k(second)
+        
+        assert len(parser._section_cache) == 1
+        assert "First filing" in parser.get_risk_factors(first)
+    
+    def test_cache_disabled(self):
+        """Test that cache_size=0 re-parses on every call."""
+        parser = SECFilingParser(cache_size=0)
+        html = "<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Risk text.</p>"
+        
+        with patch.object(parser, "_fast_extract_sections", wraps=parser._fast_extract_sections) as fast:
+            parser.get_risk_factors(html)
+            parser.get_risk_factors(html)
+        
+        assert fast.call_count == 2
+        assert len(parser._section_cache) == 0
+    
+    def test_cache_does_not_keep_html(self):
+        """Test that cached entries are keyed by digest, not the raw HTML."""
+        html = "<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Risk text.</p>"
+        
+        self.parser.parse_10k(html)
+        
+        (key,) = self.parser._section_cache
+        assert html not in key
 
 
 class TestParsedSection:
@@ -440,6 +536,81 @@ class TestParsedSection:
         assert section.end_index == 500
 
 
+class TestFastPath:
+    """Tests for the regex fast path and its DOM fallback."""
+    
+    def setup_method(self):
+        """Set up parser instance for each test."""
+        self.parser = SECFilingParser()
+    
+    def test_fast_clean_matches_dom_clean(self):
+        """Test that regex stripping yields the same text as the DOM parser."""
+        html = """
+        <html><head><style>p { color: red; }</style><script>var x = '<p>';</script></head>
+        <body>
+            <!-- comment -->
+            <h2>ITEM 7. MANAGEMENT&#8217;S DISCUSSION</h2>
+            <p>Revenue &amp; margin grew; churn &lt; 5% of accounts.</p>
+        </body></html>
+        """
+        assert self.parser._fast_clean_html(html) == self.parser.clean_html(html)
+    
+    def test_fast_clean_keeps_literal_angle_brackets(self):
+        """Test that a bare '<' in text is not treated as a tag."""
+        result = self.parser._fast_clean_html("<p>Leverage < 3x of EBITDA.</p>")
+        
+        assert "Leverage < 3x of EBITDA." in result
+    
+    @pytest.mark.parametrize("html", [
+        "<p title='x>y'>Hello</p>",
+        '<p><a href="/doc?a=1>0">Item 1A</a></p>',
+        "<script type='a>b'>var x = 1;</script><p>Body</p>",
+    ])
+    def test_fast_clean_skips_quoted_attribute_values(self, html):
+        """Test that a '>' inside a quoted attribute value does not end the tag."""
+        assert self.parser._fast_clean_html(html) == self.parser.clean_html(html)
+    
+    def test_fast_path_skips_dom_parser(self):
+        """Test that the DOM parser is not used when the fast path finds sections."""
+        html = "<html><body><h2>ITEM 1A. RISK FACTORS</h2><p>Risk content.</p></body></html>"
+        
+        with patch.object(self.parser, "clean_html", wraps=self.parser.clean_html) as clean:
+            result = self.parser.parse_10k(html)
+        
+        assert "1A" in result
+        clean.assert_not_called()
+    
+    def test_falls_back_to_dom_when_fast_path_finds_nothing(self):
+        """Test that the DOM parser runs when the fast path finds no sections."""
+        html = "<html><body>\n<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Risk content.</p>\n</body></html>"
+        
+        with patch.object(self.parser, "_fast_extract_sections", return_value={}), \
+                patch.object(self.parser, "clean_html", wraps=self.parser.clean_html) as clean:
+            result = self.parser.parse_10k(html)
+        
+        clean.assert_called_once_with(html)
+        assert "Risk content" in result["1A"].content
+    
+    def test_robust_skips_fast_path(self):
+        """Test that robust=True parses with the DOM parser directly."""
+        html = "<html><body><h2>ITEM 2.02 Results of Operations</h2><p>Q3 results.</p></body></html>"
+        
+        with patch.object(self.parser, "_fast_extract_sections") as fast:
+            result = self.parser.parse_8k(html, robust=True)
+        
+        fast.assert_not_called()
+        assert "2.02" in result
+    
+    def test_header_regexes_compiled_once(self):
+        """Test that section header patterns are compiled once and shared."""
+        first = _section_header_regexes("10-K", "1A", "Risk Factors")
+        
+        SECFilingParser().parse_10k("<h2>ITEM 1A. RISK FACTORS</h2>\n<p>Risks.</p>")
+        
+        assert _section_header_regexes("10-K", "1A", "Risk Factors") is first
+        assert all(isinstance(pattern, re.Pattern) for pattern in first)
+
+
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
     
@@ -460,7 +631,7 @@ class TestEdgeCases:
         # Should not raise an exception
         result = self.parser.parse_10k(html)
         
-        # BeautifulSoup should handle malformed HTML gracefully
+        # The HTML parser should handle malformed HTML gracefully
         assert isinstance(result, dict)
     
     def test_missing_sections(self):
@@ -0,0 +1,91 @@
+"""
+Unit tests for the LSH semantic cache.
+
+Tests cover:
+- Exact and near-duplicate hits
+- Misses for dissimilar vectors and different keys
+- Oldest-first eviction
+"""
+
+import pytest
+import numpy as np
+
+from src.retrieval.semantic_cache import LSHCache
+
+
+@pytest.fixture
+def query_vec():
+    """Fixed unit-norm query embedding."""
+    rng = np.random.default_rng(42)
+    vec = rng.standard_normal(384).astype(np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+class TestLSHCache:
+    """Tests for LSHCache."""
+    
+    def test_exact_hit(self, query_vec):
+        """Test that the same embedding returns the cached value."""
+        cache = LSHCache()
+        cache.put(query_vec, ["result"])
+        
+        assert cache.get(query_vec) == ["result"]
+    
+    def test_near_duplicate_hit(self, query_vec):
+        """Test that a slightly perturbed embedding still hits."""
+        cache = LSHCache()
+        cache.put(query_vec, "cached")
+        
+        noise = np.random.default_rng(7).standard_normal(384).astype(np.float32)
+        near = query_vec + 0.01 * noise / np.linalg.norm(noise)
+        
+        assert cache.get(near) == "cached"
+    
+    def test_dissimilar_miss(self, query_vec):
+        """Test that an unrelated embedding misses."""
+        cache = LSHCache()
+        cache.put(query_vec, "cached")
+        
+        assert cache.get(-query_vec) is None
+    
+    def test_key_must_match(self, query_vec):
+        """Test that entries under a different key never match."""
+        cache = LSHCache()
+        cache.put(query_vec, "aapl", key="AAPL")
+        
+        assert cache.get(query_vec, key="MSFT") is None
+        assert cache.get(query_vec, key="AAPL") == "aapl"
+    
+    def test_evicts_oldest(self, query_vec):
+        """Test that the oldest entry is evicted past max_entries."""
+        cache = LSHCache(max_entries=2)
+        cache.put(query_vec, "first", key=1)
+        cache.put(query_vec, "second", key=2)
+        cache.put(query_vec, "third", key=3)
+        
+        assert len(cache) == 2
+        assert cache.get(query_vec, key=1) is None
+        assert cache.get(query_vec, key=3) == "third"
+    
+    def test_clear(self, query_vec):
+        """Test that clear removes all entries."""
+        cache = LSHCache()
+        cache.put(query_vec, "cached")
+        cache.clear()
+        
+        assert len(cache) == 0
+        assert cache.get(query_vec) is None
+    
+    def test_invalid_n_bits_raises(self):
+        """Test that signatures wider than 63 bits are rejected."""
+        with pytest.raises(ValueError):
+            LSHCache(n_bits=64)
+    
+    @pytest.mark.parametrize("method", ["get", "put"])
+    def test_dimension_mismatch_raises(self, method):
+        """Test that embeddings of the wrong width are rejected clearly."""
+        cache = LSHCache(dim=384)
+        args = (np.ones(128),) if method == "get" else (np.ones(128), "cached")
+        
+        with pytest.raises(ValueError, match="128 dimensions, cache expects 384"):
+            getattr(cache, method)(*args)
@@ -447,6 +447,56 @@ class TestVectorSearch:
         assert call_args["section_names"] == ["1A", "7"]
         assert call_args["days_back"] == 180
     
+    def test_vector_search_batch_groups_by_query(self):
+        """Test that batched vector search splits rows back per query."""
+        mock_client = MagicMock()
+        row = {
+            "content": "Content",
+            "section_name": "1A",
+            "filing_type": "10-K",
+            "filing_date": "2024-01-15",
+            "similarity": 0.9,
+        }
+        mock_client.rpc.return_value.execute.return_value.data = [
+            {**row, "query_index": 0, "id": "chunk-1"},
+            {**row, "query_index": 0, "id": "chunk-2"},
+            {**row, "query_index": 2, "id": "chunk-3"},
+        ]
+        
+        store = SupabaseStore(client=mock_client)
+        query_embeddings = np.array([[0.5, -1.0], [0.0, 0.0], [1.0, 2.0]])
+        
+        results = store.vector_search_batch(query_embeddings, "AAPL", match_count=5)
+        
+        assert [[r.id for r in group] for group in results] == [["chunk-1", "chunk-2"], [], ["chunk-3"]]
+        name, params = mock_client.rpc.call_args[0]
+        assert name == "match_chunks_batch"
+        assert params["query_embeddings"][0] == "[0.5,-1.0]"
+        assert params["match_count"] == 5
+    
+    def test_keyword_search_calls_text_rpc(self):
+        """Test that keyword search uses the full-text RPC with zero similarity."""
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.return_value.data = [
+            {
+                "id": "chunk-1",
+                "content": "Substantial doubt about going concern",
+                "section_name": "7",
+                "filing_type": "10-K",
+                "filing_date": "2024-01-15",
+            },
+        ]
+        
+        store = SupabaseStore(client=mock_client)
+        results = store.keyword_search("going concern", "AAPL", section_names=["7"])
+        
+        assert [r.id for r in results] == ["chunk-1"]
+        assert results[0].similarity == 0.0
+        name, params = mock_client.rpc.call_args[0]
+        assert name == "match_chunks_text"
+        assert params["query_text"] == "going concern"
+        assert params["section_names"] == ["7"]
+    
     def test_vector_search_returns_search_results(self):
         """Test that vector search returns SearchResult objects."""
         mock_client = MagicMock()
@@ -57,8 +57,8 @@ def test_requirements_content():
         "supabase",
         "groq",
         "sentence-transformers",
-        "rank-bm25",
-        "beautifulsoup4",
+        "scipy",
+        "selectolax",
         "requests",
         "python-dotenv",
         "pytest"